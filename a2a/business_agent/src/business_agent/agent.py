@@ -43,6 +43,9 @@ from .store import RetailStore
 store = RetailStore()
 mpp = MockPaymentProcessor()
 
+_UCP_EXTENSION_URI = UcpExtension.URI
+_UCP_RESPONSE_KEYS = frozenset({UCP_CHECKOUT_KEY, "a2a.product_results"})
+
 
 def _create_error_response(message: str) -> dict:
   return {"message": message, "status": "error"}
@@ -61,7 +64,9 @@ def search_shopping_catalog(tool_context: ToolContext, query: str) -> dict:
     """
     try:
         product_results = store.search_products(query)
-        return {"a2a.product_results": product_results.model_dump(mode="json")}
+        return {
+            "a2a.product_results": store.dump_product_results(product_results)
+        }
     except Exception:
         logging.exception("There was an error searching the product catalog.")
         return _create_error_response(
@@ -84,7 +89,7 @@ def add_to_checkout(
         dict: Returns the response from the tool with success or error status.
 
     """
-    checkout_id = tool_context.state.get(ADK_USER_CHECKOUT_ID)
+    checkout_id = _get_current_checkout_id(tool_context)
     ucp_metadata = tool_context.state.get(ADK_UCP_METADATA_STATE)
 
     if not ucp_metadata:
@@ -100,7 +105,7 @@ def add_to_checkout(
             tool_context.state[ADK_USER_CHECKOUT_ID] = checkout.id
 
         return {
-            UCP_CHECKOUT_KEY: checkout.model_dump(mode="json"),
+            UCP_CHECKOUT_KEY: store.dump_checkout(checkout),
             "status": "success",
         }
     except ValueError:
@@ -130,10 +135,8 @@ def remove_from_checkout(tool_context: ToolContext, product_id: str) -> dict:
 
     try:
         return {
-            UCP_CHECKOUT_KEY: (
-                store.remove_from_checkout(checkout_id, product_id).model_dump(
-                    mode="json"
-                )
+            UCP_CHECKOUT_KEY: store.dump_checkout(
+                store.remove_from_checkout(checkout_id, product_id)
             ),
             "status": "success",
         }
@@ -168,10 +171,8 @@ def update_checkout(
 
     try:
         return {
-            UCP_CHECKOUT_KEY: (
-                store.update_checkout(
-                    checkout_id, product_id, quantity
-                ).model_dump(mode="json")
+            UCP_CHECKOUT_KEY: store.dump_checkout(
+                store.update_checkout(checkout_id, product_id, quantity)
             ),
             "status": "success",
         }
@@ -204,7 +205,7 @@ def get_checkout(tool_context: ToolContext) -> dict:
         return _create_error_response("Checkout not found with the given ID.")
 
     return {
-        UCP_CHECKOUT_KEY: checkout.model_dump(mode="json"),
+        UCP_CHECKOUT_KEY: store.dump_checkout(checkout),
         "status": "success",
     }
 
@@ -258,10 +259,10 @@ def update_customer_details(
         last_name=last_name,
     )
 
-    checkout = store.add_delivery_address(checkout_id, address)
+    store.add_delivery_address(checkout_id, address)
 
     if email:
-        checkout.buyer = Buyer(email=email)
+        store.set_buyer(checkout_id, Buyer(email=email))
 
     # invoke start payment tool once the user details are added
     return start_payment(tool_context)
@@ -301,8 +302,9 @@ async def complete_checkout(tool_context: ToolContext) -> dict:
         }
 
     try:
+        payment_instrument = payment_data[UCP_PAYMENT_DATA_KEY]
         task = mpp.process_payment(
-            payment_data[UCP_PAYMENT_DATA_KEY],
+            payment_instrument,
             payment_data[UCP_RISK_SIGNALS_KEY],
         )
 
@@ -312,7 +314,6 @@ async def complete_checkout(tool_context: ToolContext) -> dict:
             )
 
         if task.status is not None and task.status.state == TaskState.completed:
-            payment_instrument = payment_data.get(UCP_PAYMENT_DATA_KEY)
             checkout.payment.selected_instrument_id = (
                 payment_instrument.root.id
             )
@@ -322,7 +323,7 @@ async def complete_checkout(tool_context: ToolContext) -> dict:
             # clear completed checkout from state
             tool_context.state[ADK_USER_CHECKOUT_ID] = None
             return {
-                UCP_CHECKOUT_KEY: response.model_dump(mode="json"),
+                UCP_CHECKOUT_KEY: store.dump_checkout(response),
                 "status": "success",
             }
         else:
@@ -358,7 +359,7 @@ def start_payment(tool_context: ToolContext) -> dict:
     else:
         tool_context.actions.skip_summarization = True
         return {
-            UCP_CHECKOUT_KEY: result.model_dump(mode="json"),
+            UCP_CHECKOUT_KEY: store.dump_checkout(result),
             "status": "success",
         }
 
@@ -394,12 +395,12 @@ def after_tool_modifier(
         dict | None: The modified tool response, or None.
 
     """
-    extensions = tool_context.state.get(ADK_EXTENSIONS_STATE_KEY, [])
+    extensions = tool_context.state.get(ADK_EXTENSIONS_STATE_KEY, ())
+    if _UCP_EXTENSION_URI not in extensions:
+        return None
+
     # add typed data responses to the state
-    ucp_response_keys = [UCP_CHECKOUT_KEY, "a2a.product_results"]
-    if UcpExtension.URI in extensions and any(
-        key in tool_response for key in ucp_response_keys
-    ):
+    if not _UCP_RESPONSE_KEYS.isdisjoint(tool_response):
         tool_context.state[ADK_LATEST_TOOL_RESULT] = tool_response
 
     return None
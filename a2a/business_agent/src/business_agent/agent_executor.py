@@ -14,6 +14,7 @@
 
 """UCP."""
 
+from collections.abc import Sequence
 import json
 import re
 from typing import Any
@@ -44,6 +45,13 @@ from .constants import (
 )
 from .ucp_profile_resolver import ProfileResolver
 
+_MISSING = object()
+_encode_json = json.JSONEncoder(
+    separators=(",", ":"), ensure_ascii=False
+).encode
+_PROFILE_RE = re.compile(r'profile="([^"]*)"')
+_UCP_AGENT_HEADER_LOWER = UCP_AGENT_HEADER.lower()
+
 
 class UcpRequestProcessor:
     """Handle UCP-specific request processing."""
@@ -57,7 +65,9 @@ class UcpRequestProcessor:
         """
         self.profile_resolver = profile_resolver
 
-    def prepare_ucp_metadata(self, context: RequestContext) -> UcpMetadata:
+    async def prepare_ucp_metadata(
+        self, context: RequestContext
+    ) -> UcpMetadata:
         """Prepare UCP metadata from the request context.
 
         Args:
@@ -75,24 +85,24 @@ class UcpRequestProcessor:
 
         headers = context.call_context.state.get("headers")  # type: ignore
 
-        ucp_agent_header_key = next(
-            (key for key in headers if key.lower() == UCP_AGENT_HEADER.lower()),
-            None,
-        )
-
-        if not ucp_agent_header_key:
+        # the A2A Starlette app stores headers with lowercased names, so only
+        # normalize the keys when the direct lookup misses
+        ucp_agent_header_value = headers.get(_UCP_AGENT_HEADER_LOWER)
+        if ucp_agent_header_value is None:
+            ucp_agent_header_value = {
+                key.lower(): value for key, value in headers.items()
+            }.get(_UCP_AGENT_HEADER_LOWER)
+        if ucp_agent_header_value is None:
             raise ValueError("UCP-Agent should be present in request headers")
 
-        ucp_agent_header_value = headers[ucp_agent_header_key]
-
-        match = re.search(r'profile="([^"]*)"', ucp_agent_header_value)
+        match = _PROFILE_RE.search(ucp_agent_header_value)
         if not match or not match.group(1):
             raise ValueError(
                 "Client profile URL is missing or empty in UCP-Agent header"
             )
 
         client_profile_url = match.group(1)
-        client_profile_metadata = self.profile_resolver.resolve_profile(
+        client_profile_metadata = await self.profile_resolver.resolve_profile(
             client_profile_url
         )
         return self.profile_resolver.get_ucp_metadata(client_profile_metadata)
@@ -101,12 +111,12 @@ class UcpRequestProcessor:
 class ADKAgentExecutor(AgentExecutor):
     """ADK agent executor implementation."""
 
-    def __init__(self, agent, extensions: list[AgentExtension]):
+    def __init__(self, agent, extensions: Sequence[AgentExtension]):
         """Initialize a generic ADK agent executor.
 
         Args:
             agent: The ADK agent instance.
-            extensions: List of agent extensions to be used.
+            extensions: Agent extensions to be used.
 
         """
         self.agent = agent
@@ -115,7 +125,10 @@ class ADKAgentExecutor(AgentExecutor):
             agent=agent,
             session_service=InMemorySessionService(),
         )
-        self.extensions = extensions or []
+        self.extensions = tuple(extensions or ())
+        # ids of the sessions this executor has created in its session service
+        self._known_sessions: set[str] = set()
+        self._extension_uris = frozenset(ext.uri for ext in self.extensions)
         self.profile_resolver = ProfileResolver()
         self.ucp_processor = UcpRequestProcessor(self.profile_resolver)
 
@@ -148,19 +161,21 @@ class ADKAgentExecutor(AgentExecutor):
             The session object.
 
         """
-        session = await self.runner.session_service.get_session(
-            app_name=self.agent.name,
-            user_id=user_id,
-            session_id=context.context_id,  # type: ignore
-        )
-        if session is None:
+        session_id: str = context.context_id  # type: ignore
+        if session_id not in self._known_sessions:
             session = await self.runner.session_service.create_session(
                 app_name=self.agent.name,
                 user_id=user_id,
-                session_id=context.context_id,  # type: ignore
+                session_id=session_id,
             )
+            self._known_sessions.add(session_id)
+            return session
 
-        return session
+        return await self.runner.session_service.get_session(
+            app_name=self.agent.name,
+            user_id=user_id,
+            session_id=session_id,
+        )
 
     async def execute(
         self,
@@ -178,7 +193,7 @@ class ADKAgentExecutor(AgentExecutor):
             raise ValueError("Message should be present in request context")
 
         self._activate_extensions(context)
-        ucp_metadata = self.ucp_processor.prepare_ucp_metadata(context)
+        ucp_metadata = await self.ucp_processor.prepare_ucp_metadata(context)
 
         query, payment_data = self._prepare_input(context)
 
@@ -207,10 +222,8 @@ class ADKAgentExecutor(AgentExecutor):
             context: The request context.
 
         """
-        if context.requested_extensions:
-            for ext in self.extensions:
-                if ext.uri in context.requested_extensions:
-                    context.add_activated_extension(ext.uri)
+        for uri in self._extension_uris & context.requested_extensions:
+            context.add_activated_extension(uri)
 
     def _prepare_input(
         self,
@@ -225,28 +238,27 @@ class ADKAgentExecutor(AgentExecutor):
             tuple[str, dict | None]: The query and payment data.
 
         """
-        query = context.get_user_input()
+        query_parts = [context.get_user_input()]
         data_list = get_data_parts(context.message.parts)  # type: ignore
         payment_payload: dict[str, Any] = {}
-        payment_keys = [UCP_PAYMENT_DATA_KEY, UCP_RISK_SIGNALS_KEY]
 
         # extract payment data related structured inputs
         # for processing by tools from the state
         for data_part in data_list:
-            for key in payment_keys:
-                if key in data_part:
-                    value = data_part.pop(key)
-                    if key == UCP_PAYMENT_DATA_KEY:
-                        payment_payload[key] = (
-                            PaymentInstrument.model_validate(value)
-                        )
-                    else:
-                        payment_payload[key] = value
+            payment_data = data_part.pop(UCP_PAYMENT_DATA_KEY, _MISSING)
+            if payment_data is not _MISSING:
+                payment_payload[UCP_PAYMENT_DATA_KEY] = (
+                    PaymentInstrument.model_validate(payment_data)
+                )
+
+            risk_signals = data_part.pop(UCP_RISK_SIGNALS_KEY, _MISSING)
+            if risk_signals is not _MISSING:
+                payment_payload[UCP_RISK_SIGNALS_KEY] = risk_signals
 
             if data_part:
-                query += "\n" + json.dumps(data_part)
+                query_parts.append(_encode_json(data_part))
 
-        return query, payment_payload or None
+        return "\n".join(query_parts), payment_payload or None
 
     def _build_initial_state_delta(
         self,
@@ -303,8 +315,8 @@ class ADKAgentExecutor(AgentExecutor):
             context, ucp_metadata, payment_data
         )
         result_parts: list[Part] = []
-
-        final_events: list = []
+        final_response_started = False
+        has_data_part = False
 
         async for event in self.runner.run_async(
             user_id=user_id,
@@ -312,21 +324,23 @@ class ADKAgentExecutor(AgentExecutor):
             new_message=content,
             state_delta=state_delta,
         ):
-            if event.is_final_response() or len(final_events) > 0:
-                final_events.append(event)
-
-        for final_event in final_events:
-            response_text = ""
-            for part in final_event.content.parts:  # type: ignore
+            # process the final response and every event after it as they
+            # arrive instead of buffering them
+            if not final_response_started and not event.is_final_response():
+                continue
+            final_response_started = True
+
+            text_chunks: list[str] = []
+            for part in event.content.parts:  # type: ignore
                 result_part = self._process_event_part(part)
                 if isinstance(result_part, DataPart):
                     result_parts.append(Part(root=result_part))
+                    has_data_part = True
                 elif isinstance(result_part, TextPart):
-                    response_text += result_part.text
+                    text_chunks.append(result_part.text)
 
-            if response_text and not any(
-                isinstance(p.root, DataPart) for p in result_parts
-            ):
+            response_text = "".join(text_chunks)
+            if response_text and not has_data_part:
                 result_parts.append(Part(root=TextPart(text=response_text)))
 
         return result_parts
@@ -14,6 +14,7 @@
 
 """UCP."""
 
+from .merchant_profile import load_merchant_profile
 from .type_generator import get_checkout_type
 
-__all__ = ["get_checkout_type"]
+__all__ = ["get_checkout_type", "load_merchant_profile"]
@@ -0,0 +1,36 @@
+# Copyright 2026 UCP Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""UCP."""
+
+import functools
+from pathlib import Path
+from pydantic_core import from_json
+
+
+_UCP_PATH = Path(__file__).parent.parent / "data" / "ucp.json"
+
+
+@functools.lru_cache(maxsize=1)
+def load_merchant_profile() -> dict:
+    """Load the merchant's UCP profile from data/ucp.json.
+
+    The file is parsed once and the same dict is returned to every caller,
+    so callers must not mutate it.
+
+    Returns:
+        dict: The merchant profile.
+
+    """
+    return from_json(_UCP_PATH.read_bytes())
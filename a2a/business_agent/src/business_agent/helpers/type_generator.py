@@ -14,6 +14,7 @@
 
 """UCP."""
 
+import functools
 from pydantic import create_model
 from ucp_sdk.models.schemas.shopping.buyer_consent_resp import (
     Checkout as BuyerConsentCheckout,
@@ -36,6 +37,15 @@ from ..constants import (
 )
 
 
+_KNOWN_CAPABILITIES = frozenset(
+    {
+        UCP_FULFILLMENT_EXTENSION,
+        UCP_BUYER_CONSENT_EXTENSION,
+        UCP_DISCOUNT_EXTENSION,
+    }
+)
+
+
 def get_checkout_type(ucp_metadata: UcpMetadata) -> type[Checkout]:
     """Generate a dynamic Checkout type based on UCP metadata capabilities.
 
@@ -46,15 +56,30 @@ def get_checkout_type(ucp_metadata: UcpMetadata) -> type[Checkout]:
         type[Checkout]: The generated dynamic checkout class.
 
     """
-    selected_base_models = []
+    active_capability_names = frozenset(
+        c.name for c in ucp_metadata.capabilities
+    )
+    return _build_checkout_type(active_capability_names & _KNOWN_CAPABILITIES)
+
+
+@functools.lru_cache(maxsize=16)
+def _build_checkout_type(capability_names: frozenset[str]) -> type[Checkout]:
+    """Build the Checkout type for a set of capability names.
 
-    active_capability_names = {c.name for c in ucp_metadata.capabilities}
+    Args:
+        capability_names: The active capabilities that extend checkout.
+
+    Returns:
+        type[Checkout]: The generated dynamic checkout class.
+
+    """
+    selected_base_models = []
 
-    if UCP_FULFILLMENT_EXTENSION in active_capability_names:
+    if UCP_FULFILLMENT_EXTENSION in capability_names:
         selected_base_models.append(FulfillmentCheckout)
-    if UCP_BUYER_CONSENT_EXTENSION in active_capability_names:
+    if UCP_BUYER_CONSENT_EXTENSION in capability_names:
         selected_base_models.append(BuyerConsentCheckout)
-    if UCP_DISCOUNT_EXTENSION in active_capability_names:
+    if UCP_DISCOUNT_EXTENSION in capability_names:
         selected_base_models.append(DiscountCheckout)
 
     if not selected_base_models:
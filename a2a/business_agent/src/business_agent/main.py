@@ -16,7 +16,6 @@
 
 import asyncio
 import functools
-import json
 import logging
 import os
 
@@ -28,11 +27,16 @@ from a2a.types import AgentCard
 import click
 from dotenv import load_dotenv
 from starlette.applications import Starlette
-from starlette.responses import FileResponse
+from starlette.responses import Response
 from starlette.routing import Mount, Route
 from starlette.staticfiles import StaticFiles
 import uvicorn
 
+try:
+    import uvloop
+except ImportError:  # uvloop is not available on Windows
+    uvloop = None
+
 from .agent import root_agent as business_agent
 from .agent_executor import ADKAgentExecutor
 
@@ -42,6 +46,26 @@ logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 logger.addHandler(logging.StreamHandler())
 
+_DATA_DIR = Path(__file__).parent / "data"
+_CARD_PATH = _DATA_DIR / "agent_card.json"
+_UCP_PATH = _DATA_DIR / "ucp.json"
+_IMAGES_DIR = _DATA_DIR / "images"
+_IMAGES_CACHE_CONTROL = "public, max-age=86400"
+
+
+class CachedStaticFiles(StaticFiles):
+    """StaticFiles that lets clients cache responses.
+
+    Starlette already sends an ETag and answers conditional requests with
+    304; Cache-Control also lets clients skip revalidating altogether.
+    """
+
+    def file_response(self, *args, **kwargs) -> Response:
+        """Return the file response with a Cache-Control header."""
+        response = super().file_response(*args, **kwargs)
+        response.headers.setdefault("Cache-Control", _IMAGES_CACHE_CONTROL)
+        return response
+
 
 def make_sync(func):
     """Wrap an async function to run synchronously.
@@ -61,6 +85,8 @@ def make_sync(func):
 
     @functools.wraps(func)
     def wrapper(*args, **kwargs):
+        if uvloop is not None:
+            return uvloop.run(func(*args, **kwargs))
         return asyncio.run(func(*args, **kwargs))
 
     return wrapper
@@ -82,18 +108,21 @@ async def run(host, port):
         logger.error("GOOGLE_API_KEY must be set")
         exit(1)
 
-    base_path = Path(__file__).parent
-    card_path = base_path / "data" / "agent_card.json"
-    with card_path.open(encoding="utf-8") as f:
-        data = json.load(f)
-    agent_card = AgentCard.model_validate(data)
+    # ucp.json is static, so serve it from memory instead of hitting the
+    # filesystem on every discovery request. Both files are read off the
+    # event loop, concurrently.
+    card_json, ucp_json = await asyncio.gather(
+        asyncio.to_thread(_CARD_PATH.read_bytes),
+        asyncio.to_thread(_UCP_PATH.read_bytes),
+    )
+    agent_card = AgentCard.model_validate_json(card_json)
 
     task_store = InMemoryTaskStore()
 
     request_handler = DefaultRequestHandler(
         agent_executor=ADKAgentExecutor(
             agent=business_agent,
-            extensions=agent_card.capabilities.extensions or [],
+            extensions=agent_card.capabilities.extensions or (),
         ),
         task_store=task_store,
     )
@@ -106,18 +135,20 @@ async def run(host, port):
         [
             Route(
                 "/.well-known/ucp",
-                lambda _: FileResponse(base_path / "data" / "ucp.json"),
+                lambda _: Response(ucp_json, media_type="application/json"),
             ),
             Mount(
                 "/images",
-                app=StaticFiles(directory=str(base_path / "data" / "images")),
+                app=CachedStaticFiles(directory=str(_IMAGES_DIR)),
                 name="images",
             ),
         ]
     )
     app = Starlette(routes=routes)
 
-    config = uvicorn.Config(app, host=host, port=port, log_level="info")
+    config = uvicorn.Config(
+        app, host=host, port=port, log_level="info", access_log=False
+    )
     server = uvicorn.Server(config)
     await server.serve()
 
@@ -15,15 +15,18 @@
 """UCP."""
 
 from enum import Enum
-from typing import Literal
-from pydantic import BaseModel, ConfigDict, Field
+from typing import Annotated, Literal
+from pydantic import BaseModel, ConfigDict, Field, TypeAdapter
 
 
 class ProductDiscoveryModel(BaseModel):
     """Base class for all product discovery types."""
 
     model_config = ConfigDict(
-        populate_by_name=True, serialize_by_alias=True, extra="allow"
+        populate_by_name=True,
+        serialize_by_alias=True,
+        extra="allow",
+        frozen=True,
     )
 
 
@@ -40,6 +43,8 @@ class PropertyValue(BaseModel):
 class ImageObject(ProductDiscoveryModel):
     """Corresponds to schema.org/ImageObject."""
 
+    model_config = ConfigDict(extra="ignore")
+
     url: str
     caption: str | None = None
     schema_type: Literal["ImageObject"] = Field(
@@ -50,6 +55,8 @@ class ImageObject(ProductDiscoveryModel):
 class Organization(ProductDiscoveryModel):
     """Corresponds to schema.org/Organization."""
 
+    model_config = ConfigDict(extra="ignore")
+
     name: str
     schema_type: Literal["Organization"] = Field(
         default="Organization", alias="@type"
@@ -59,6 +66,8 @@ class Organization(ProductDiscoveryModel):
 class Brand(ProductDiscoveryModel):
     """Corresponds to schema.org/Brand."""
 
+    model_config = ConfigDict(extra="ignore")
+
     name: str
     schema_type: Literal["Brand"] = Field(default="Brand", alias="@type")
 
@@ -72,6 +81,8 @@ class PriceType(str, Enum):
 class MemberProgramTier(ProductDiscoveryModel):
     """Corresponds to schema.org/MemberProgramTier."""
 
+    model_config = ConfigDict(extra="ignore")
+
     id: str = Field(alias="@id")
     schema_type: Literal["MemberProgramTier"] = Field(
         default="MemberProgramTier", alias="@type"
@@ -81,6 +92,8 @@ class MemberProgramTier(ProductDiscoveryModel):
 class QuantitativeValue(ProductDiscoveryModel):
     """Corresponds to schema.org/QuantitativeValue."""
 
+    model_config = ConfigDict(extra="ignore")
+
     value: str | None = None
     unit_code: str = Field(alias="unitCode")
     schema_type: Literal["QuantitativeValue"] = Field(
@@ -190,6 +203,8 @@ class AggregateRating(ProductDiscoveryModel):
 class SizeSpecification(ProductDiscoveryModel):
     """Corresponds to schema.org/SizeSpecification."""
 
+    model_config = ConfigDict(extra="ignore")
+
     name: str
     size_group: str | None = Field(alias="sizeGroup", default=None)
     size_system: str | None = Field(alias="sizeSystem", default=None)
@@ -201,6 +216,8 @@ class SizeSpecification(ProductDiscoveryModel):
 class MonetaryAmount(ProductDiscoveryModel):
     """Corresponds to schema.org/MonetaryAmount."""
 
+    model_config = ConfigDict(extra="ignore")
+
     schema_type: Literal["MonetaryAmount"] = Field(
         default="MonetaryAmount", alias="@type"
     )
@@ -213,6 +230,8 @@ class MonetaryAmount(ProductDiscoveryModel):
 class DefinedRegion(ProductDiscoveryModel):
     """Corresponds to schema.org/DefinedRegion."""
 
+    model_config = ConfigDict(extra="ignore")
+
     schema_type: Literal["DefinedRegion"] = Field(
         default="DefinedRegion", alias="@type"
     )
@@ -225,6 +244,8 @@ class DefinedRegion(ProductDiscoveryModel):
 class ShippingQuantitativeValue(ProductDiscoveryModel):
     """Corresponds to schema.org/QuantitativeValue."""
 
+    model_config = ConfigDict(extra="ignore")
+
     max_value: int
     min_value: int
     unit_code: str = Field(alias="unitCode", default="DAY")
@@ -309,6 +330,8 @@ class MerchantReturnPolicy(ProductDiscoveryModel):
 class Rating(ProductDiscoveryModel):
     """Corresponds to schema.org/Rating."""
 
+    model_config = ConfigDict(extra="ignore")
+
     schema_type: Literal["Rating"] = Field(default="Rating", alias="@type")
     rating_value: float = Field(alias="ratingValue")
     rating_explanation: str | None = Field(
@@ -457,5 +480,14 @@ class ProductResults(ProductDiscoveryModel):
 
     content: str | None = None
     hints: list[str] | None = None
-    results: list[Product | ProductGroup | ProductCollection]
+    results: list[
+        Annotated[
+            Product | ProductGroup | ProductCollection,
+            Field(discriminator="schema_type"),
+        ]
+    ]
     next_page_token: str | None = None
+
+
+# Compiled once and shared by everything that validates product lists.
+PRODUCT_LIST_ADAPTER = TypeAdapter(list[Product])
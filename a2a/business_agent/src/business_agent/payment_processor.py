@@ -20,6 +20,14 @@ from ucp_sdk.models.schemas.shopping.types.payment_instrument import (
     PaymentInstrument,
 )
 
+# The mock always reports the same completed task and callers only read
+# it, so build it once instead of on every payment.
+_COMPLETED_TASK = Task(
+    context_id="a unique context id",
+    id="a unique task id",
+    status=TaskStatus(state=TaskState.completed),
+)
+
 
 class MockPaymentProcessor:
     """Mock Payment Processor simulating Merchant Agent to MPP Agent calls."""
@@ -39,10 +47,5 @@ class MockPaymentProcessor:
         """
         # this should invoke the Merchant Payment Processor
         # to validate the payment
-        task = Task(
-            context_id="a unique context id",
-            id="a unique task id",
-            status=TaskStatus(state=TaskState.completed),
-        )
         # return a task that represents the payment processing has completed
-        return task
+        return _COMPLETED_TASK
@@ -15,6 +15,7 @@
 """UCP."""
 
 from decimal import Decimal
+import itertools
 import json
 from pathlib import Path
 from uuid import uuid4
@@ -27,6 +28,7 @@ from ucp_sdk.models.schemas.shopping.fulfillment_resp import (
 )
 from ucp_sdk.models.schemas.shopping.fulfillment_resp import Fulfillment
 from ucp_sdk.models.schemas.shopping.payment_resp import PaymentResponse
+from ucp_sdk.models.schemas.shopping.types.buyer import Buyer
 from ucp_sdk.models.schemas.shopping.types.fulfillment_destination_resp import (
     FulfillmentDestinationResponse,
 )
@@ -57,12 +59,47 @@ from ucp_sdk.models.schemas.shopping.types.total_resp import (
     TotalResponse as Total,
 )
 from ucp_sdk.models.schemas.ucp import ResponseCheckout as UcpMetadata
-from .helpers import get_checkout_type
-from .models.product_types import ImageObject, Product, ProductResults
+from .helpers import get_checkout_type, load_merchant_profile
+from .models.product_types import (
+    PRODUCT_LIST_ADAPTER,
+    ImageObject,
+    Product,
+    ProductResults,
+)
 
 
 DEFAULT_CURRENCY = "USD"
 
+_TOTAL_DISPLAY_TEXT = {
+    "items_discount": "Items Discount",
+    "subtotal": "Subtotal",
+    "discount": "Discount",
+    "fulfillment": "Shipping",
+    "tax": "Tax",
+    "total": "Total",
+}
+
+
+def _make_total(total_type: str, amount: int) -> Total:
+    """Build a checkout total from values computed by the store.
+
+    The type and amount are produced internally, so the model is
+    constructed without re-running validation.
+
+    Args:
+        total_type (str): type of the total
+        amount (int): amount in minor currency units
+
+    Returns:
+        Total: total object
+
+    """
+    return Total.model_construct(
+        type=total_type,
+        display_text=_TOTAL_DISPLAY_TEXT[total_type],
+        amount=amount,
+    )
+
 
 class RetailStore:
     """Mock Retail Store for demo purposes.
@@ -75,27 +112,97 @@ class RetailStore:
         """Initialize the retail store."""
         self._products = {}
         self._checkouts = {}
+        self._checkout_dumps = {}
+        # checkout id -> {product id: line item} for that checkout
+        self._line_items = {}
+        # checkout id -> shipping amount of its selected fulfillment option
+        self._shipping_amounts = {}
+        self._product_dumps = {}
+        # product id -> unit price in cents, for products that have a price
+        self._unit_prices = {}
+        # product id -> url of the product's first image, if any
+        self._image_urls = {}
+        # substring of a lowercased name/category word -> product ids
+        self._search_index = {}
         self._orders = {}
+        # sequence for ids that only need to be unique within this store
+        self._id_sequence = itertools.count(1)
         self._initialize_ucp_metadata()
         self._initialize_products()
+        # static data shared by every checkout; none of it is mutated
+        self._fulfillment_options = self._build_fulfillment_options()
 
     def _initialize_ucp_metadata(self):
         """Load UCP metadata from data/ucp.json."""
-        base_path = Path(__file__).parent
-        ucp_path = base_path / "data" / "ucp.json"
-        with ucp_path.open() as f:
-            self._ucp_metadata = json.load(f)
+        self._ucp_metadata = load_merchant_profile()
+        # validate the payment handlers once rather than for every checkout
+        self._payment_handlers = PaymentResponse(
+            handlers=self._ucp_metadata["payment"]["handlers"]
+        ).handlers
 
     def _initialize_products(self):
         """Load products from a JSON file and store them for lookup."""
         base_path = Path(__file__).parent
         products_path = base_path / "data" / "products.json"
-        with products_path.open() as f:
-            products_data = json.load(f)
-            for product_data in products_data:
-                # we only have products in the json file
-                product = Product.model_validate(product_data)
-                self._products[product.product_id] = product
+        # we only have products in the json file; parse and validate the
+        # whole catalog in a single pass instead of per-item model_validate
+        products = PRODUCT_LIST_ADAPTER.validate_json(
+            products_path.read_bytes()
+        )
+        for product in products:
+            self._products[product.product_id] = product
+            self._product_dumps[product.product_id] = product.model_dump_json()
+            if product.offers and product.offers.price:
+                self._unit_prices[product.product_id] = int(
+                    Decimal(product.offers.price) * 100
+                )
+            image_url = self._get_image_url(product)
+            self._image_urls[product.product_id] = (
+                AnyUrl(image_url) if image_url else None
+            )
+            self._index_product(product)
+
+    def _get_image_url(self, product: Product) -> str | None:
+        """Return the url of the product's image, or its first image.
+
+        Args:
+            product (Product): catalog product
+
+        Returns:
+            str | None: image url if the product has one
+
+        """
+        image = product.image
+        if isinstance(image, str):
+            return image
+        if image:
+            first_image = image[0]
+            if isinstance(first_image, ImageObject):
+                return first_image.url
+            return first_image
+        return None
+
+    def _index_product(self, product: Product) -> None:
+        """Add a product to the search index.
+
+        Search keywords never contain whitespace, so a keyword occurs in the
+        lowercased name or category exactly when it is a substring of one of
+        their words. Indexing every such substring turns a search into one
+        dict lookup per keyword.
+
+        Args:
+            product (Product): catalog product to index
+
+        """
+        text = f"{product.name} {product.category or ''}".lower()
+        for word in set(text.split()):
+            for start in range(len(word)):
+                for end in range(start + 1, len(word) + 1):
+                    product_ids = self._search_index.setdefault(
+                        word[start:end], []
+                    )
+                    if not product_ids or product_ids[-1] != product.product_id:
+                        product_ids.append(product.product_id)
 
     def search_products(self, query: str) -> ProductResults:
         """Search the product catalog for products that match the given query.
@@ -107,28 +214,31 @@ class RetailStore:
             ProductResults: product items that match the criteria of the query
 
         """
-        # return existing products for now
-        all_products = list(self._products.values())
-
-        matching_products = {}
-
-        keywords = query.lower().split()
-        for keyword in keywords:
-            for product in all_products:
-                if product.product_id not in matching_products and (
-                    keyword in product.name.lower()
-                    or (
-                        product.category
-                        and keyword in product.category.lower()
-                    )
-                ):
-                    matching_products[product.product_id] = product
+        # repeated keywords would only look up the same ids again
+        keywords = dict.fromkeys(query.lower().split())
+        if not keywords:
+            return ProductResults.model_construct(
+                results=[], content="No products found"
+            )
 
-        product_list = list(matching_products.values())
+        # dict.fromkeys dedupes the ids while keeping first-match order
+        matching_ids = dict.fromkeys(
+            product_id
+            for keyword in keywords
+            for product_id in self._search_index.get(keyword, ())
+        )
+
+        # results come from the already validated catalog, so skip
+        # re-validating every product when wrapping them
+        product_list = [
+            self._products[product_id] for product_id in matching_ids
+        ]
         if not product_list:
-            return ProductResults(results=[], content="No products found")
+            return ProductResults.model_construct(
+                results=[], content="No products found"
+            )
 
-        return ProductResults(results=product_list)
+        return ProductResults.model_construct(results=product_list)
 
     def get_product(self, product_id: str) -> Product | None:
         """Retrieve a product by its SKU.
@@ -142,6 +252,44 @@ class RetailStore:
         """
         return self._products.get(product_id)
 
+    def dump_product_results(self, product_results: ProductResults) -> dict:
+        """Return the JSON-mode dump of search results.
+
+        Catalog products never change, so each result reuses the JSON taken
+        when the catalog was loaded instead of being re-serialized per search.
+        The results are parsed afresh on every call, so the caller may modify
+        them.
+
+        Args:
+            product_results (ProductResults): results from search_products
+
+        Returns:
+            dict: JSON-compatible product results payload
+
+        """
+        dumped = product_results.model_dump(mode="json", exclude={"results"})
+        results_json = ",".join(
+            self._product_dumps[product.product_id]
+            for product in product_results.results
+        )
+        dumped["results"] = json.loads(f"[{results_json}]")
+        return dumped
+
+    def _next_id(self, prefix: str) -> str:
+        """Return a new id for a line item or fulfillment entry.
+
+        Checkout ids stay random since clients use them to address a
+        checkout; these internal ids only need to be unique.
+
+        Args:
+            prefix (str): prefix describing what the id is for
+
+        Returns:
+            str: id unique within this store
+
+        """
+        return f"{prefix}_{next(self._id_sequence):x}"
+
     def _get_line_item(self, product: Product, quantity: int) -> LineItem:
         """Create a line item for a product.
 
@@ -153,31 +301,18 @@ class RetailStore:
             LineItem: Line item object
 
         """
-        # read product.offers.price, convert to Decimal
-        if not product.offers or not product.offers.price:
+        # product.offers.price converted to cents when the catalog was loaded
+        unit_price = self._unit_prices.get(product.product_id)
+        if unit_price is None:
             raise ValueError(f"Product {product.name} does not have a price.")
 
-        unit_price = int(Decimal(product.offers.price) * 100)
-
-        image_url = None
-
-        if isinstance(product.image, list):
-            if isinstance(product.image, str):
-                image_url = product.image
-            elif isinstance(product.image, list) and product.image:
-                first_image = product.image[0]
-                if isinstance(first_image, str):
-                    image_url = first_image
-                elif isinstance(first_image, ImageObject):
-                    image_url = first_image.url
-
         return LineItem(
-            id=uuid4().hex,
+            id=self._next_id("li"),
             item=Item(
                 id=product.product_id,
                 price=unit_price,
                 title=product.name,
-                image_url=AnyUrl(image_url) if image_url else None,
+                image_url=self._image_urls.get(product.product_id),
             ),
             quantity=quantity,
             totals=[],
@@ -217,27 +352,26 @@ class RetailStore:
                 totals=[],
                 status="incomplete",
                 links=[],
-                payment=PaymentResponse(
-                    handlers=self._ucp_metadata["payment"]["handlers"]
-                ),
+                payment=PaymentResponse(handlers=self._payment_handlers),
             )
+            line_items = {}
         else:
             checkout = self._checkouts.get(checkout_id)
             if not checkout:
                 raise ValueError(f"Checkout with ID {checkout_id} not found")
+            line_items = self._line_items[checkout_id]
 
-        found = False
-        for line_item in checkout.line_items:
-            if line_item.item.id == product_id:
-                line_item.quantity += quantity
-                found = True
-                break
-        if not found:
-            order_item = self._get_line_item(product, quantity)
-            checkout.line_items.append(order_item)
+        line_item = line_items.get(product_id)
+        if line_item is not None:
+            line_item.quantity += quantity
+        else:
+            line_item = self._get_line_item(product, quantity)
+            checkout.line_items.append(line_item)
+            line_items[product_id] = line_item
 
         self._recalculate_checkout(checkout)
-        self._checkouts[checkout_id] = checkout
+        self._line_items[checkout.id] = line_items
+        self._save_checkout(checkout)
 
         return checkout
 
@@ -253,6 +387,57 @@ class RetailStore:
         """
         return self._checkouts.get(checkout_id)
 
+    def set_buyer(self, checkout_id: str, buyer: Buyer) -> Checkout:
+        """Set the buyer on the checkout.
+
+        Args:
+            checkout_id (str): ID of the checkout to update
+            buyer (Buyer): The buyer details
+
+        Returns:
+            Checkout: checkout object
+
+        """
+        checkout = self.get_checkout(checkout_id)
+        if checkout is None:
+            raise ValueError(f"Checkout with ID {checkout_id} not found")
+
+        checkout.buyer = buyer
+        self._save_checkout(checkout)
+        return checkout
+
+    def dump_checkout(self, checkout: Checkout) -> dict:
+        """Return the JSON-mode dump of a checkout.
+
+        The JSON of a stored checkout is cached until the checkout is next
+        saved, so repeated reads of an unchanged checkout are not
+        re-serialized. Each call returns a freshly parsed dict that the
+        caller may modify.
+
+        Args:
+            checkout (Checkout): checkout object
+
+        Returns:
+            dict: JSON-compatible checkout payload
+
+        """
+        dumped = self._checkout_dumps.get(checkout.id)
+        if dumped is None:
+            dumped = checkout.model_dump_json()
+            if checkout.id in self._checkouts:
+                self._checkout_dumps[checkout.id] = dumped
+        return json.loads(dumped)
+
+    def _save_checkout(self, checkout: Checkout) -> None:
+        """Store a checkout and drop its cached dump.
+
+        Args:
+            checkout (Checkout): checkout object
+
+        """
+        self._checkouts[checkout.id] = checkout
+        self._checkout_dumps.pop(checkout.id, None)
+
     def remove_from_checkout(
         self, checkout_id: str, product_id: str
     ) -> Checkout:
@@ -271,13 +456,12 @@ class RetailStore:
         if checkout is None:
             raise ValueError(f"Checkout with ID {checkout_id} not found")
 
-        for line_item in checkout.line_items:
-            if line_item.item.id == product_id:
-                checkout.line_items.remove(line_item)
-                break
+        line_item = self._line_items[checkout_id].pop(product_id, None)
+        if line_item is not None:
+            checkout.line_items.remove(line_item)
 
         self._recalculate_checkout(checkout)
-        self._checkouts[checkout_id] = checkout
+        self._save_checkout(checkout)
         return checkout
 
     def update_checkout(
@@ -299,13 +483,12 @@ class RetailStore:
         if checkout is None:
             raise ValueError(f"Checkout with ID {checkout_id} not found")
 
-        for line_item in checkout.line_items:
-            if line_item.item.id == product_id:
-                line_item.quantity = quantity
-                break
+        line_item = self._line_items[checkout_id].get(product_id)
+        if line_item is not None:
+            line_item.quantity = quantity
 
         self._recalculate_checkout(checkout)
-        self._checkouts[checkout_id] = checkout
+        self._save_checkout(checkout)
         return checkout
 
     def _recalculate_checkout(self, checkout: Checkout) -> None:
@@ -327,21 +510,9 @@ class RetailStore:
             base_amount = unit_price * line_item.quantity
             discount = 0
             line_item.totals = [
-                Total(
-                    type="items_discount",
-                    display_text="Items Discount",
-                    amount=discount,
-                ),
-                Total(
-                    type="subtotal",
-                    display_text="Subtotal",
-                    amount=base_amount - discount,
-                ),
-                Total(
-                    type="total",
-                    display_text="Total",
-                    amount=base_amount - discount,
-                ),
+                _make_total("items_discount", discount),
+                _make_total("subtotal", base_amount - discount),
+                _make_total("total", base_amount - discount),
             ]
 
             items_base_amount += base_amount
@@ -351,17 +522,9 @@ class RetailStore:
         discount = 0
 
         totals = [
-            Total(
-                type="items_discount",
-                display_text="Items Discount",
-                amount=items_discount,
-            ),
-            Total(
-                type="subtotal",
-                display_text="Subtotal",
-                amount=items_base_amount - items_discount,
-            ),
-            Total(type="discount", display_text="Discount", amount=discount),
+            _make_total("items_discount", items_discount),
+            _make_total("subtotal", items_base_amount - items_discount),
+            _make_total("discount", discount),
         ]
 
         final_total = subtotal - discount
@@ -369,38 +532,15 @@ class RetailStore:
         if isinstance(checkout, FulfillmentCheckout) and checkout.fulfillment:
             # add taxes and shipping if checkout has fulfillment address
             tax = round(subtotal * 0.1)  # assume 10% flat tax
-            selected_fulfillment_option = None
-
-            # Find selected option in the fulfillment structure
-            if checkout.fulfillment.root.methods:
-                for method in checkout.fulfillment.root.methods:
-                    if method.groups:
-                        for group in method.groups:
-                            if group.selected_option_id:
-                                for option in group.options or []:
-                                    if option.id == group.selected_option_id:
-                                        selected_fulfillment_option = option
-                                        break
-
-            if selected_fulfillment_option:
-                shipping = 0
-                for total in selected_fulfillment_option.totals:
-                    if total.type == "total":
-                        shipping = total.amount
-                        break
-                totals.append(
-                    Total(
-                        type="fulfillment",
-                        display_text="Shipping",
-                        amount=shipping,
-                    )
-                )
-                totals.append(Total(type="tax", display_text="Tax", amount=tax))
+            # recorded when the fulfillment option was selected
+            shipping = self._shipping_amounts.get(checkout.id)
+
+            if shipping is not None:
+                totals.append(_make_total("fulfillment", shipping))
+                totals.append(_make_total("tax", tax))
                 final_total += shipping + tax
 
-        totals.append(
-            Total(type="total", display_text="Total", amount=final_total)
-        )
+        totals.append(_make_total("total", final_total))
         checkout.totals = totals
         checkout.continue_url = AnyUrl(
             f"https://example.com/checkout?id={checkout.id}"
@@ -424,27 +564,36 @@ class RetailStore:
             raise ValueError(f"Checkout with ID {checkout_id} not found")
 
         if isinstance(checkout, FulfillmentCheckout):
-            dest_id = f"dest_{uuid4().hex[:8]}"
+            dest_id = self._next_id("dest")
             destination = FulfillmentDestinationResponse(
                 root=ShippingDestinationResponse(
                     id=dest_id, **address.model_dump()
                 )
             )
 
-            fulfillment_options = self._get_fulfillment_options()
-            selected_option_id = fulfillment_options[0].id
+            fulfillment_options = self._fulfillment_options
+            selected_option = fulfillment_options[0]
+            selected_option_id = selected_option.id
+            self._shipping_amounts[checkout_id] = next(
+                (
+                    total.amount
+                    for total in selected_option.totals
+                    if total.type == "total"
+                ),
+                0,
+            )
 
             line_item_ids = [li.item.id for li in checkout.line_items]
 
             group = FulfillmentGroupResponse(
-                id=f"package_{uuid4().hex[:8]}",
+                id=self._next_id("package"),
                 line_item_ids=line_item_ids,
                 options=fulfillment_options,
                 selected_option_id=selected_option_id,
             )
 
             method = FulfillmentMethodResponse(
-                id=f"method_{uuid4().hex[:8]}",
+                id=self._next_id("method"),
                 type="shipping",
                 line_item_ids=line_item_ids,
                 destinations=[destination],
@@ -457,7 +606,7 @@ class RetailStore:
             )
 
         self._recalculate_checkout(checkout)
-        self._checkouts[checkout_id] = checkout
+        self._save_checkout(checkout)
         return checkout
 
     def start_payment(self, checkout_id: str) -> Checkout | str:
@@ -490,9 +639,9 @@ class RetailStore:
         if messages:
             return "\n".join(messages)
 
-        self._recalculate_checkout(checkout)
+        # every cart and fulfillment change already recalculated the totals
         checkout.status = "ready_for_complete"
-        self._checkouts[checkout_id] = checkout
+        self._save_checkout(checkout)
         return checkout
 
     def place_order(self, checkout_id: str) -> Checkout:
@@ -520,10 +669,13 @@ class RetailStore:
         self._orders[order_id] = checkout
         # Clear the checkout after placing the order
         del self._checkouts[checkout_id]
+        self._checkout_dumps.pop(checkout_id, None)
+        self._line_items.pop(checkout_id, None)
+        self._shipping_amounts.pop(checkout_id, None)
         return checkout
 
-    def _get_fulfillment_options(self) -> list[FulfillmentOptionResponse]:
-        """Return a list of available fulfillment options.
+    def _build_fulfillment_options(self) -> list[FulfillmentOptionResponse]:
+        """Build the list of available fulfillment options.
 
         Returns:
             list[FulfillmentOptionResponse]: Available fulfillment options.
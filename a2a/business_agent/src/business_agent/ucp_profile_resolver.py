@@ -14,14 +14,17 @@
 
 """UCP."""
 
-from pathlib import Path
+import asyncio
 from datetime import datetime
-import json
 from a2a.types import InternalError
 from a2a.utils.errors import ServerError
 import httpx
 from ucp_sdk.models.schemas.capability import Response as UcpMetadataCapability
 from ucp_sdk.models.schemas.ucp import ResponseCheckout as UcpMetadata
+from .helpers import load_merchant_profile
+
+# bound on remembered unsupported profiles; the oldest entry is dropped first
+_MAX_UNSUPPORTED_PROFILES = 256
 
 
 class ProfileResolver:
@@ -30,7 +33,13 @@ class ProfileResolver:
     def __init__(self):
         """Initialize the profile resolver."""
         self.profiles = {}
-        self.httpx_client = httpx.Client()
+        # profile url -> error for profiles with an unsupported version
+        self.unsupported_profiles = {}
+        # one lock per profile url so concurrent requests share a fetch;
+        # dropped once no request is waiting on it
+        self._fetch_locks: dict[str, asyncio.Lock] = {}
+        self._fetch_waiters: dict[str, int] = {}
+        self.httpx_client = httpx.AsyncClient(timeout=httpx.Timeout(5.0))
         self._load_merchant_profile()
 
     def _load_merchant_profile(self) -> UcpMetadata:
@@ -40,13 +49,18 @@ class ProfileResolver:
             UcpMetadata: The loaded merchant profile.
 
         """
-        base_path = Path(__file__).parent
-        ucp_path = base_path / "data" / "ucp.json"
-        with ucp_path.open() as f:
-            self.merchant_profile = json.load(f)
+        self.merchant_profile = load_merchant_profile()
+        self._merchant_version = datetime.strptime(
+            self.merchant_profile.get("ucp").get("version"), "%Y-%m-%d"
+        ).date()
+        # validated once; get_ucp_metadata picks from these per client
+        self._merchant_capabilities = [
+            UcpMetadataCapability(**c)
+            for c in self.merchant_profile.get("ucp").get("capabilities", [])
+        ]
         return self.merchant_profile
 
-    def _fetch_profile(self, client_profile_url: str) -> dict:
+    async def _fetch_profile(self, client_profile_url: str) -> dict:
         """Fetch a profile from a URL.
 
         Args:
@@ -56,11 +70,11 @@ class ProfileResolver:
             dict: The fetched profile object.
 
         """
-        response = self.httpx_client.get(client_profile_url)
+        response = await self.httpx_client.get(client_profile_url)
         response.raise_for_status()
         return response.json()
 
-    def resolve_profile(self, client_profile_url: str) -> dict:
+    async def resolve_profile(self, client_profile_url: str) -> dict:
         """Resolve a profile url to a UCP profile object.
 
         Args:
@@ -77,32 +91,69 @@ class ProfileResolver:
         if client_profile_url in self.profiles:
             return self.profiles[client_profile_url]
 
-        profile = self._fetch_profile(client_profile_url)
+        lock = self._fetch_locks.setdefault(client_profile_url, asyncio.Lock())
+        self._fetch_waiters[client_profile_url] = (
+            self._fetch_waiters.get(client_profile_url, 0) + 1
+        )
+        try:
+            async with lock:
+                return await self._resolve_uncached_profile(client_profile_url)
+        finally:
+            self._fetch_waiters[client_profile_url] -= 1
+            if not self._fetch_waiters[client_profile_url]:
+                del self._fetch_waiters[client_profile_url]
+                del self._fetch_locks[client_profile_url]
+
+    async def _resolve_uncached_profile(self, client_profile_url: str) -> dict:
+        """Fetch and check a profile that is not cached yet.
+
+        Must be called while holding the fetch lock for the url, so a
+        profile that another request resolved meanwhile is not refetched.
+
+        Args:
+            client_profile_url: The URL of the profile to resolve.
+
+        Returns:
+            dict: The resolved profile object.
+
+        Raises:
+            ValueError: If the profile version is missing.
+            ServerError: If the version is not supported.
+
+        """
+        if client_profile_url in self.profiles:
+            return self.profiles[client_profile_url]
+        if client_profile_url in self.unsupported_profiles:
+            raise ServerError(
+                error=self.unsupported_profiles[client_profile_url]
+            )
+
+        profile = await self._fetch_profile(client_profile_url)
 
         client_version = profile.get("ucp").get("version")
         if not client_version:
             raise ValueError("Profile version is missing")
 
-        merchant_version = self.merchant_profile.get("ucp").get("version")
-
         client_version = datetime.strptime(client_version, "%Y-%m-%d").date()
-        merchant_version = datetime.strptime(
-            merchant_version, "%Y-%m-%d"
-        ).date()
+        merchant_version = self._merchant_version
 
         if client_version > merchant_version:
-            raise ServerError(
-                error=InternalError(
-                    message=(
-                        f"Version {client_version} is not supported. "
-                        f"This merchant implements version {merchant_version}."
-                    ),
-                    data={
-                        "code": "VERSION_UNSUPPORTED",
-                        "severity": "critical",
-                    },
-                )
+            error = InternalError(
+                message=(
+                    f"Version {client_version} is not supported. "
+                    f"This merchant implements version {merchant_version}."
+                ),
+                data={
+                    "code": "VERSION_UNSUPPORTED",
+                    "severity": "critical",
+                },
             )
+            if len(self.unsupported_profiles) >= _MAX_UNSUPPORTED_PROFILES:
+                del self.unsupported_profiles[
+                    next(iter(self.unsupported_profiles))
+                ]
+            self.unsupported_profiles[client_profile_url] = error
+            raise ServerError(error=error)
 
         self.profiles[client_profile_url] = profile
         return profile
@@ -117,23 +168,18 @@ class ProfileResolver:
             UcpMetadata: The created UCP metadata object.
 
         """
-        client_capabilities: list[UcpMetadataCapability] = [
-            UcpMetadataCapability(**c)
-            for c in client_profile_metadata.get("ucp").get("capabilities", [])
-        ]
-        merchant_capabilities: list[UcpMetadataCapability] = [
-            UcpMetadataCapability(**c)
-            for c in self.merchant_profile.get("ucp").get("capabilities", [])
-        ]
-
+        # client capabilities are only matched against, so compare their raw
+        # name/version pairs instead of validating each one into a model
         client_capabilities_set = {
-            (capability.name, capability.version.root)
-            for capability in client_capabilities
+            (capability.get("name"), capability.get("version"))
+            for capability in client_profile_metadata.get("ucp").get(
+                "capabilities", []
+            )
         }
 
         common_capabilites = [
             merchant_capability
-            for merchant_capability in merchant_capabilities
+            for merchant_capability in self._merchant_capabilities
             if (merchant_capability.name, merchant_capability.version.root)
             in client_capabilities_set
         ]
@@ -0,0 +1,185 @@
+# Copyright 2026 UCP Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Tests for the retail store."""
+
+import unittest
+from business_agent.helpers import load_merchant_profile
+from business_agent.store import RetailStore
+from ucp_sdk.models.schemas.capability import Response as UcpMetadataCapability
+from ucp_sdk.models.schemas.ucp import ResponseCheckout as UcpMetadata
+
+
+class DumpCheckoutTest(unittest.TestCase):
+    """Tests for RetailStore.dump_checkout."""
+
+    def setUp(self):
+        """Create a store with a two-item checkout."""
+        ucp = load_merchant_profile()["ucp"]
+        metadata = UcpMetadata(
+            version=ucp["version"],
+            capabilities=[
+                UcpMetadataCapability(**c) for c in ucp["capabilities"]
+            ],
+        )
+        self.store = RetailStore()
+        first, second = list(self.store._products)[:2]
+        self.checkout = self.store.add_to_checkout(metadata, first, 2)
+        self.store.add_to_checkout(metadata, second, 1, self.checkout.id)
+
+    def test_mutating_a_dump_does_not_change_the_next_one(self):
+        """Callers may modify a dump without corrupting the cached copy."""
+        expected = self.checkout.model_dump(mode="json")
+
+        dumped = self.store.dump_checkout(self.checkout)
+        dumped["status"] = "canceled"
+        dumped["line_items"][0]["quantity"] = 99
+        dumped["totals"].clear()
+
+        self.assertEqual(self.store.dump_checkout(self.checkout), expected)
+
+    def test_dump_reflects_later_changes(self):
+        """Saving a checkout drops its cached dump."""
+        self.store.dump_checkout(self.checkout)
+        product_id = self.checkout.line_items[0].item.id
+
+        self.store.remove_from_checkout(self.checkout.id, product_id)
+
+        dumped = self.store.dump_checkout(self.checkout)
+        self.assertNotIn(
+            product_id, [li["item"]["id"] for li in dumped["line_items"]]
+        )
+
+
+class SearchProductsTest(unittest.TestCase):
+    """Tests for RetailStore.search_products."""
+
+    def setUp(self):
+        """Create a store with the demo catalog."""
+        self.store = RetailStore()
+
+    def _search_ids(self, query):
+        """Return the ids of the products found for a query."""
+        results = self.store.search_products(query)
+        return [product.product_id for product in results.results]
+
+    def _scan_ids(self, query):
+        """Return the ids a scan of the whole catalog finds for a query."""
+        matching_ids = {}
+        for keyword in query.lower().split():
+            for product in self.store._products.values():
+                if product.product_id not in matching_ids and (
+                    keyword in product.name.lower()
+                    or (
+                        product.category
+                        and keyword in product.category.lower()
+                    )
+                ):
+                    matching_ids[product.product_id] = None
+        return list(matching_ids)
+
+    def test_matches_substrings_of_names(self):
+        """A keyword matches inside a word of the product name."""
+        self.assertEqual(
+            self._search_ids("cook"), ["BISC-001", "O-COOKIES-001"]
+        )
+        self.assertEqual(self._search_ids("BERRIES"), ["STRAW-001"])
+
+    def test_matches_categories(self):
+        """A keyword matches the product category as well as its name."""
+        self.assertEqual(self._search_ids("produce"), ["STRAW-001"])
+        self.assertEqual(
+            self._search_ids("snacks"),
+            ["BISC-001", "CHIPS-001", "SW-CHIPS-001", "O-COOKIES-001"],
+        )
+
+    def test_results_keep_first_match_order_without_duplicates(self):
+        """Products are listed once, in the order their keyword matched."""
+        self.assertEqual(
+            self._search_ids("chips cookies snacks"),
+            ["CHIPS-001", "SW-CHIPS-001", "BISC-001", "O-COOKIES-001"],
+        )
+
+    def test_empty_and_repeated_keywords(self):
+        """Blank queries find nothing and repeated keywords change nothing."""
+        for query in ("", "   "):
+            results = self.store.search_products(query)
+            self.assertEqual(results.results, [])
+            self.assertEqual(results.content, "No products found")
+        self.assertEqual(
+            self._search_ids("cookies cookies"), self._search_ids("cookies")
+        )
+
+    def test_no_match(self):
+        """A keyword that occurs nowhere finds nothing."""
+        results = self.store.search_products("flowers")
+        self.assertEqual(results.results, [])
+        self.assertEqual(results.content, "No products found")
+
+    def test_matches_a_scan_of_the_catalog(self):
+        """The index finds the same products, in order, as a full scan."""
+        for query in (
+            "c",
+            "chip",
+            "potato sweet",
+            "Nutri-Bar",
+            "&",
+            ">",
+            "groceries fruits",
+            "oat bars cook",
+            "baked BAKED",
+            "xyz cookies",
+        ):
+            with self.subTest(query=query):
+                self.assertEqual(
+                    self._search_ids(query), self._scan_ids(query)
+                )
+
+
+class DumpProductResultsTest(unittest.TestCase):
+    """Tests for RetailStore.dump_product_results."""
+
+    def setUp(self):
+        """Create a store with the demo catalog."""
+        self.store = RetailStore()
+
+    def test_matches_a_full_dump(self):
+        """Cached product dumps match serializing the results directly."""
+        results = self.store.search_products("chips")
+
+        self.assertEqual(
+            self.store.dump_product_results(results),
+            results.model_dump(mode="json"),
+        )
+
+    def test_mutating_a_dump_does_not_change_the_next_search(self):
+        """Callers may modify a result without corrupting the catalog."""
+        expected = self.store.search_products("cookies").model_dump(mode="json")
+
+        dumped = self.store.dump_product_results(
+            self.store.search_products("cookies")
+        )
+        dumped["results"][0]["name"] = "HACKED"
+        dumped["results"][0]["offers"]["price"] = "0.00"
+
+        self.assertEqual(
+            self.store.dump_product_results(
+                self.store.search_products("cookies")
+            ),
+            expected,
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
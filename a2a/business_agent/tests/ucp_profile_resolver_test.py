@@ -0,0 +1,139 @@
+# Copyright 2026 UCP Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Tests for the UCP profile resolver."""
+
+import asyncio
+import unittest
+from unittest import mock
+from a2a.utils.errors import ServerError
+from business_agent import ucp_profile_resolver
+from business_agent.ucp_profile_resolver import ProfileResolver
+
+_SUPPORTED_VERSION = "2020-01-01"
+_UNSUPPORTED_VERSION = "2999-01-01"
+
+
+class ResolveProfileTest(unittest.IsolatedAsyncioTestCase):
+    """Tests for ProfileResolver.resolve_profile."""
+
+    async def asyncSetUp(self):
+        """Create a resolver whose fetches are recorded instead of sent."""
+        self.resolver = ProfileResolver()
+        self.fetched_urls = []
+        # cleared by a test to hold fetches until it sets it again
+        self.fetch_released = asyncio.Event()
+        self.fetch_released.set()
+        self.resolver._fetch_profile = self._fetch_profile
+
+    async def asyncTearDown(self):
+        """Close the resolver's http client."""
+        await self.resolver.httpx_client.aclose()
+
+    async def _fetch_profile(self, url):
+        """Return a profile whose version depends on the url."""
+        self.fetched_urls.append(url)
+        await self.fetch_released.wait()
+        if "unsupported" in url:
+            version = _UNSUPPORTED_VERSION
+        else:
+            version = _SUPPORTED_VERSION
+        return {"ucp": {"version": version, "capabilities": []}}
+
+    async def test_concurrent_first_requests_share_one_fetch(self):
+        """Requests for an uncached url wait for a single fetch."""
+        self.fetch_released.clear()
+        url = "https://agent.example/profile"
+
+        requests = asyncio.gather(
+            self.resolver.resolve_profile(url),
+            self.resolver.resolve_profile(url),
+        )
+        await asyncio.sleep(0)
+        self.fetch_released.set()
+        first, second = await requests
+
+        self.assertEqual(self.fetched_urls, [url])
+        self.assertIs(first, second)
+        self.assertIs(self.resolver.profiles[url], first)
+
+    async def test_lock_is_dropped_after_the_last_waiter(self):
+        """The per-url lock lives only while requests are waiting on it."""
+        self.fetch_released.clear()
+        url = "https://agent.example/profile"
+
+        requests = asyncio.gather(
+            self.resolver.resolve_profile(url),
+            self.resolver.resolve_profile(url),
+        )
+        await asyncio.sleep(0)
+        self.assertIn(url, self.resolver._fetch_locks)
+        self.assertEqual(self.resolver._fetch_waiters, {url: 2})
+
+        self.fetch_released.set()
+        await requests
+
+        self.assertEqual(self.resolver._fetch_locks, {})
+        self.assertEqual(self.resolver._fetch_waiters, {})
+
+    async def test_lock_is_dropped_when_the_fetch_fails(self):
+        """A failed fetch still releases the per-url lock entry."""
+        self.resolver._fetch_profile = mock.AsyncMock(
+            side_effect=ValueError("unreachable")
+        )
+
+        with self.assertRaises(ValueError):
+            await self.resolver.resolve_profile("https://agent.example/down")
+
+        self.assertEqual(self.resolver._fetch_locks, {})
+        self.assertEqual(self.resolver._fetch_waiters, {})
+
+    async def test_cached_rejection_is_not_refetched(self):
+        """An unsupported profile is rejected again without a new fetch."""
+        url = "https://agent.example/unsupported"
+
+        for _ in range(2):
+            with self.assertRaises(ServerError) as raised:
+                await self.resolver.resolve_profile(url)
+            self.assertEqual(
+                raised.exception.error.data["code"], "VERSION_UNSUPPORTED"
+            )
+
+        self.assertEqual(self.fetched_urls, [url])
+
+    async def test_oldest_rejection_is_evicted_when_full(self):
+        """The rejection cache drops its oldest url once it is full."""
+        urls = [f"https://agent.example/unsupported/{i}" for i in range(3)]
+
+        with mock.patch.object(
+            ucp_profile_resolver, "_MAX_UNSUPPORTED_PROFILES", 2
+        ):
+            for url in urls:
+                with self.assertRaises(ServerError):
+                    await self.resolver.resolve_profile(url)
+            self.assertEqual(list(self.resolver.unsupported_profiles), urls[1:])
+
+            # the evicted url is fetched again, the cached ones are not
+            for url in (urls[0], urls[2]):
+                with self.assertRaises(ServerError):
+                    await self.resolver.resolve_profile(url)
+
+        self.assertEqual(self.fetched_urls, [*urls, urls[0]])
+        self.assertEqual(
+            list(self.resolver.unsupported_profiles), [urls[2], urls[0]]
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -29,10 +29,13 @@ Usage:
 """
 
 import argparse
+import functools
 import json
 import logging
+import os
 from pathlib import Path
-import uuid
+import re
+from typing import TextIO
 import httpx
 from ucp_sdk.models.schemas.shopping import checkout_create_req
 from ucp_sdk.models.schemas.shopping import checkout_update_req
@@ -60,23 +63,40 @@ def get_headers() -> dict[str, str]:
   return {
     "UCP-Agent": 'profile="https://agent.example/profile"',
     "request-signature": "test",
-    "idempotency-key": str(uuid.uuid4()),
-    "request-id": str(uuid.uuid4()),
+    "idempotency-key": os.urandom(16).hex(),
+    "request-id": os.urandom(16).hex(),
   }
 
 
 def remove_none_values(obj):
   """Recursively remove keys with None values from a dictionary or list."""
-  if isinstance(obj, dict):
+  # Decoded JSON only holds plain dicts and lists, so exact type checks are
+  # enough and skip isinstance's subclass handling for every scalar leaf.
+  obj_type = type(obj)
+  if obj_type is dict:
     return {k: remove_none_values(v) for k, v in obj.items() if v is not None}
-  elif isinstance(obj, list):
+  elif obj_type is list:
     return [remove_none_values(v) for v in obj]
   else:
     return obj
 
 
+def substitute_variables(text: str, replacements: dict[str, str]) -> str:
+  """Replace known values in text with their shell variable names.
+
+  All values are matched in a single pass, longest first, so a value that is
+  a prefix of another one never splits it.
+  """
+  if not replacements:
+    return text
+  pattern = re.compile(
+    "|".join(map(re.escape, sorted(replacements, key=len, reverse=True)))
+  )
+  return pattern.sub(lambda m: f"${replacements[m.group(0)]}", text)
+
+
 def log_interaction(
-  filename: str,
+  f: TextIO,
   method: str,
   url: str,
   headers: dict[str, str],
@@ -86,67 +106,63 @@ def log_interaction(
   replacements: dict[str, str] | None = None,
   extractions: dict[str, str] | None = None,
 ):
-  """Log the request and response to a markdown file."""
+  """Log the request and response to the open markdown export file."""
   replacements = replacements or {}
 
   extractions = extractions or {}
 
-  with Path(filename).open("a", encoding="utf-8") as f:
-    f.write(f"## {step_description}\n\n")
-
-    # --- Request (Curl) ---
-    # Apply replacements to URL
-    display_url = url
-    for val, var_name in replacements.items():
-      if val in display_url:
-        display_url = display_url.replace(val, f"${var_name}")
-
-    curl_cmd = f"export RESPONSE=$(curl -s -X {method} {display_url} \\\n"
-
-    # Headers
-    # We generally don't tokenize headers in this simple script,
-    # but could if needed.
-    for k, v in headers.items():
-      curl_cmd += f"  -H '{k}: {v}' \\\n"
-
-    # Body
-    if json_body:
-      curl_cmd += "  -H 'Content-Type: application/json' \\\n"
-      clean_body = remove_none_values(json_body)
-      json_str = json.dumps(clean_body, indent=2)
-
-      # Apply replacements to body
-      for val, var_name in replacements.items():
-        # Simple string replacement - safer to do on the JSON string
-        # than traversing the dict for this doc-gen purpose.
-        if val in json_str:
-          json_str = json_str.replace(val, f"${var_name}")
-
-      curl_cmd += f"  -d '{json_str}')\n"
-    else:
-      curl_cmd = curl_cmd.rstrip(" \\\n") + ")\n"
+  # Collect the section and write it with a single call
+  parts: list[str] = [f"## {step_description}\n\n"]
+
+  # --- Request (Curl) ---
+  # Apply replacements to URL
+  display_url = substitute_variables(url, replacements)
 
-    f.write("### Request\n\n```bash\n" + curl_cmd + "```\n\n")
+  # Headers
+  # We generally don't tokenize headers in this simple script,
+  # but could if needed.
+  curl_cmd = f"export RESPONSE=$(curl -s -X {method} {display_url} \\\n" + (
+    "".join(f"  -H '{k}: {v}' \\\n" for k, v in headers.items())
+  )
+
+  # Body
+  if json_body:
+    curl_cmd += "  -H 'Content-Type: application/json' \\\n"
+    # Request bodies are dumped with exclude_none=True, so unlike the
+    # response they carry no None values to strip.
+    # Swap known ids and values in the serialized body for their shell
+    # variables; substitute_variables does it in one regex pass.
+    json_str = substitute_variables(
+      json.dumps(json_body, indent=2), replacements
+    )
 
-    # --- Response ---
+    curl_cmd += f"  -d '{json_str}')\n"
+  else:
+    curl_cmd = curl_cmd.rstrip(" \\\n") + ")\n"
+
+  parts.append("### Request\n\n```bash\n" + curl_cmd + "```\n\n")
 
-    f.write("### Response\n\n")
+  # --- Response ---
 
-    try:
-      resp_json = response.json()
-      clean_resp = remove_none_values(resp_json)
-      f.write("```json\n" + json.dumps(clean_resp, indent=2) + "\n```\n\n")
-    except json.JSONDecodeError:
-      f.write(f"```\n{response.text}\n```\n\n")
+  parts.append("### Response\n\n")
 
-    # --- Extract Variables ---
-    if extractions:
-      f.write("### Extract Variables\n\n```bash\n")
-      for var_name, jq_expr in extractions.items():
-        # We assume the user has the response in a variable or pipe.
-        # For the snippet, we'll assume they pipe the previous curl output.
-        f.write(f"export {var_name}=$(echo $RESPONSE | jq -r '{jq_expr}')\n")
-      f.write("```\n\n")
+  try:
+    resp_json = response.json()
+    clean_resp = remove_none_values(resp_json)
+    parts.append("```json\n" + json.dumps(clean_resp, indent=2) + "\n```\n\n")
+  except json.JSONDecodeError:
+    parts.append(f"```\n{response.text}\n```\n\n")
+
+  # --- Extract Variables ---
+  if extractions:
+    parts.append("### Extract Variables\n\n```bash\n")
+    for var_name, jq_expr in extractions.items():
+      # We assume the user has the response in a variable or pipe.
+      # For the snippet, we'll assume they pipe the previous curl output.
+      parts.append(f"export {var_name}=$(echo $RESPONSE | jq -r '{jq_expr}')\n")
+    parts.append("```\n\n")
+
+  f.write("".join(parts))
 
 
 def main() -> None:
@@ -177,10 +193,13 @@ def main() -> None:
 
   client = httpx.Client(base_url=args.server_url)
 
-  # Clear the export file if it exists
+  # Open the export file once for the whole run, clearing it if it exists
+  export_file = None
   if args.export_requests_to:
-    with Path(args.export_requests_to).open("w", encoding="utf-8") as f:
-      f.write("""<!--
+    export_file = Path(args.export_requests_to).open(  # noqa: SIM115
+      "w", encoding="utf-8"
+    )
+    export_file.write("""<!--
    Copyright 2026 UCP Authors
 
    Licensed under the Apache License, Version 2.0 (the "License");
@@ -200,17 +219,24 @@ Note:
    Do not modify manually.
 -->
 """)
-      f.write("# UCP Happy Path Interaction Log\n\n")
-      f.write("### Configuration\n\n")
-      f.write(f"```bash\nexport SERVER_URL={args.server_url}\n```\n\n")
-      f.write(
-        "> **Note:** In the bash snippets below, `jq` is used to extract"
-        " values from the JSON response.\n"
-      )
-      f.write(
-        "> It is assumed that the response body of the previous `curl`"
-        " command is captured in a variable named `$RESPONSE`.\n\n"
-      )
+    export_file.write("# UCP Happy Path Interaction Log\n\n")
+    export_file.write("### Configuration\n\n")
+    export_file.write(f"```bash\nexport SERVER_URL={args.server_url}\n```\n\n")
+    export_file.write(
+      "> **Note:** In the bash snippets below, `jq` is used to extract"
+      " values from the JSON response.\n"
+    )
+    export_file.write(
+      "> It is assumed that the response body of the previous `curl`"
+      " command is captured in a variable named `$RESPONSE`.\n\n"
+    )
+
+  # Bind the exporter once so the steps below need no per-step export check
+  log = (
+    functools.partial(log_interaction, export_file)
+    if export_file
+    else lambda *_args, **_kwargs: None
+  )
 
   # Track dynamic values to replace in subsequent requests
   # Map: actual_value -> variable_name
@@ -229,17 +255,15 @@ Note:
 
     response = client.get(url)
 
-    if args.export_requests_to:
-      log_interaction(
-        args.export_requests_to,
-        "GET",
-        f"{args.server_url}{url}",
-        {},
-        None,
-        response,
-        "Step 0: Discovery",
-        replacements=global_replacements,
-      )
+    log(
+      "GET",
+      f"{args.server_url}{url}",
+      {},
+      None,
+      response,
+      "Step 0: Discovery",
+      replacements=global_replacements,
+    )
 
     if response.status_code != 200:
       logger.error("Discovery failed: %s", response.text)
@@ -329,18 +353,16 @@ Note:
       global_replacements[li_id] = "LINE_ITEM_1_ID"
       extractions["LINE_ITEM_1_ID"] = ".line_items[0].id"
 
-    if args.export_requests_to:
-      log_interaction(
-        args.export_requests_to,
-        "POST",
-        f"{args.server_url}{url}",
-        headers,
-        json_body,
-        response,
-        "Step 1: Create Checkout Session",
-        replacements=global_replacements,
-        extractions=extractions,
-      )
+    log(
+      "POST",
+      f"{args.server_url}{url}",
+      headers,
+      json_body,
+      response,
+      "Step 1: Create Checkout Session",
+      replacements=global_replacements,
+      extractions=extractions,
+    )
 
     if response.status_code not in [200, 201]:
       logger.error("Failed to create checkout: %s", response.text)
@@ -422,18 +444,16 @@ Note:
 
       extractions["LINE_ITEM_2_ID"] = ".line_items[1].id"
 
-    if args.export_requests_to:
-      log_interaction(
-        args.export_requests_to,
-        "PUT",
-        f"{args.server_url}{url}",
-        headers,
-        json_body,
-        response,
-        "Step 2: Add Items (Update Checkout)",
-        replacements=global_replacements,
-        extractions=extractions,
-      )
+    log(
+      "PUT",
+      f"{args.server_url}{url}",
+      headers,
+      json_body,
+      response,
+      "Step 2: Add Items (Update Checkout)",
+      replacements=global_replacements,
+      extractions=extractions,
+    )
 
     if response.status_code != 200:
       logger.error("Failed to add items: %s", response.text)
@@ -517,17 +537,15 @@ Note:
       headers=headers,
     )
 
-    if args.export_requests_to:
-      log_interaction(
-        args.export_requests_to,
-        "PUT",
-        f"{args.server_url}{url}",
-        headers,
-        json_body,
-        response,
-        "Step 3: Apply Discount",
-        replacements=global_replacements,
-      )
+    log(
+      "PUT",
+      f"{args.server_url}{url}",
+      headers,
+      json_body,
+      response,
+      "Step 3: Apply Discount",
+      replacements=global_replacements,
+    )
 
     if response.status_code != 200:
       logger.error("Failed to apply discount: %s", response.text)
@@ -654,23 +672,18 @@ Note:
             ".fulfillment.methods[0].destinations[0].id"
           )
 
-      if args.export_requests_to:
-        log_interaction(
-          args.export_requests_to,
-          "PUT",
-          f"{args.server_url}{url}",
-          headers,
-          trigger_payload,
-          response,
-          "Step 4: Trigger Fulfillment",
-          replacements=global_replacements,
-          extractions=extractions,
-        )
-
-      if response.status_code == 200:
-        checkout_data = response.json()
+      log(
+        "PUT",
+        f"{args.server_url}{url}",
+        headers,
+        trigger_payload,
+        response,
+        "Step 4: Trigger Fulfillment",
+        replacements=global_replacements,
+        extractions=extractions,
+      )
 
-      else:
+      if response.status_code != 200:
         logger.warning("Failed to trigger fulfillment: %s", response.text)
 
     if checkout_data.get("fulfillment") and checkout_data["fulfillment"].get(
@@ -705,17 +718,15 @@ Note:
           headers=headers,
         )
 
-        if args.export_requests_to:
-          log_interaction(
-            args.export_requests_to,
-            "PUT",
-            f"{args.server_url}{url}",
-            headers,
-            payload,
-            response,
-            "Step 5: Select Destination",
-            replacements=global_replacements,
-          )
+        log(
+          "PUT",
+          f"{args.server_url}{url}",
+          headers,
+          payload,
+          response,
+          "Step 5: Select Destination",
+          replacements=global_replacements,
+        )
 
         if response.status_code != 200:
           logger.error("Failed to select destination: %s", response.text)
@@ -755,17 +766,15 @@ Note:
             headers=headers,
           )
 
-          if args.export_requests_to:
-            log_interaction(
-              args.export_requests_to,
-              "PUT",
-              f"{args.server_url}{url}",
-              headers,
-              payload,
-              response,
-              "Step 6: Select Option",
-              replacements=global_replacements,
-            )
+          log(
+            "PUT",
+            f"{args.server_url}{url}",
+            headers,
+            payload,
+            response,
+            "Step 6: Select Option",
+            replacements=global_replacements,
+          )
 
           if response.status_code != 200:
             logger.error("Failed to select option: %s", response.text)
@@ -870,18 +879,16 @@ Note:
 
       extractions["ORDER_ID"] = ".order.id"
 
-    if args.export_requests_to:
-      log_interaction(
-        args.export_requests_to,
-        "POST",
-        f"{args.server_url}{url}",
-        headers,
-        final_payload,
-        response,
-        "Step 7: Complete Checkout",
-        replacements=global_replacements,
-        extractions=extractions,
-      )
+    log(
+      "POST",
+      f"{args.server_url}{url}",
+      headers,
+      final_payload,
+      response,
+      "Step 7: Complete Checkout",
+      replacements=global_replacements,
+      extractions=extractions,
+    )
 
     if response.status_code != 200:
       logger.error("Payment failed: %s", response.text)
@@ -909,6 +916,8 @@ Note:
 
   finally:
     client.close()
+    if export_file:
+      export_file.close()
 
 
 if __name__ == "__main__":
@@ -15,6 +15,7 @@
 """Shared configuration and startup logic for UCP servers."""
 
 import contextlib
+import functools
 import json
 from pathlib import Path
 import uuid
@@ -24,22 +25,15 @@ from fastapi import FastAPI
 
 FLAGS = flags.FLAGS
 
-_SERVER_VERSION_CACHE = None
+_PROFILE_PATH = (
+  Path(__file__).resolve().parent / "routes" / "discovery_profile.json"
+)
 
 
+@functools.cache
 def get_server_version() -> str:
   """Read and cache the server version from the discovery profile."""
-  global _SERVER_VERSION_CACHE
-  if _SERVER_VERSION_CACHE:
-    return _SERVER_VERSION_CACHE
-
-  current_dir = Path(__file__).resolve().parent
-  profile_path = current_dir / "routes" / "discovery_profile.json"
-
-  with profile_path.open() as f:
-    data = json.load(f)
-    _SERVER_VERSION_CACHE = data["ucp"]["version"]
-    return _SERVER_VERSION_CACHE
+  return json.loads(_PROFILE_PATH.read_bytes())["ucp"]["version"]
 
 
 # Define flags only if they haven't been defined yet (to avoid duplicates
@@ -32,12 +32,18 @@ concurrent
   the database models.
 """
 
+import asyncio
 import datetime
+import functools
+import json
 import logging
+import pathlib
 from typing import Any
 import uuid
 
+from sqlalchemy import and_
 from sqlalchemy import Column
+from sqlalchemy import event
 from sqlalchemy import ForeignKey
 from sqlalchemy import Integer
 from sqlalchemy import JSON
@@ -45,18 +51,83 @@ from sqlalchemy import select
 from sqlalchemy import String
 from sqlalchemy import text
 from sqlalchemy import update
+from sqlalchemy.engine import URL
+from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.ext.asyncio import async_sessionmaker
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.ext.asyncio import create_async_engine
 from sqlalchemy.orm import declarative_base
 from sqlalchemy.orm import relationship
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 
 logger = logging.getLogger(__name__)
 
 ProductBase = declarative_base()
 TransactionBase = declarative_base()
 
+# Applied to every new SQLite connection. journal_mode persists in the file,
+# the rest are per-connection settings. Under WAL, synchronous=NORMAL cannot
+# corrupt the database and avoids an fsync on every commit, but the most recent
+# commits may be lost if the machine loses power.
+_SQLITE_PRAGMAS = (
+  "PRAGMA journal_mode=WAL",
+  "PRAGMA synchronous=NORMAL",
+  "PRAGMA temp_store=MEMORY",
+  "PRAGMA cache_size=-65536",
+  "PRAGMA mmap_size=268435456",
+)
+
+
+# Keep enough pooled connections for concurrent requests so they are reused
+# (with their pragmas) instead of being reopened under load. The pool class is
+# explicit because older SQLAlchemy 2.0 releases default aiosqlite file
+# databases to NullPool, which rejects pool sizing arguments.
+_FILE_POOL_OPTIONS = {
+  "poolclass": AsyncAdaptedQueuePool,
+  "pool_size": 10,
+  "max_overflow": 20,
+}
+
+# JSON columns are written without the default separator whitespace; reads
+# are unaffected.
+_compact_json_dumps = functools.partial(json.dumps, separators=(",", ":"))
+
+
+def _apply_sqlite_pragmas(dbapi_connection, connection_record) -> None:
+  """Configure a newly opened SQLite connection."""
+  del connection_record  # Unused.
+  cursor = dbapi_connection.cursor()
+  for pragma in _SQLITE_PRAGMAS:
+    cursor.execute(pragma)
+  cursor.close()
+
+
+def _create_missing_indexes(sync_conn, metadata) -> None:
+  """Create indexes added to the models after a database file was created.
+
+  create_all only creates indexes together with new tables, so existing
+  databases would otherwise never pick up newly declared indexes.
+  """
+  for table in metadata.sorted_tables:
+    for index in table.indexes:
+      index.create(sync_conn, checkfirst=True)
+
+
+def _create_sqlite_engine(path: str) -> AsyncEngine:
+  """Create an aiosqlite engine with the shared pool and connection tuning."""
+  options: dict[str, Any] = {"json_serializer": _compact_json_dumps}
+  # In-memory databases use a single static connection, which can't be sized
+  if path not in ("", ":memory:"):
+    options.update(_FILE_POOL_OPTIONS)
+  engine = create_async_engine(
+    f"sqlite+aiosqlite:///{path}", echo=False, **options
+  )
+
+  # Enable WAL mode and tuning pragmas for every new connection
+  event.listen(engine.sync_engine, "connect", _apply_sqlite_pragmas)
+  return engine
+
 
 class DatabaseManager:
   """Manages database engines and sessions without using global variables."""
@@ -65,53 +136,79 @@ class DatabaseManager:
     """Initialize DatabaseManager."""
     self.products_engine: AsyncEngine | None = None
     self.transactions_engine: AsyncEngine | None = None
-    self.products_session_factory: sessionmaker | None = None
-    self.transactions_session_factory: sessionmaker | None = None
+    self.products_session_factory: async_sessionmaker | None = None
+    self.transactions_session_factory: async_sessionmaker | None = None
 
   async def init_dbs(self, products_path: str, transactions_path: str) -> None:
     """Initialize database engines and creates tables."""
-    # Products DB Setup
-    prod_url = f"sqlite+aiosqlite:///{products_path}"
-    self.products_engine = create_async_engine(prod_url, echo=False)
+    # The two databases are independent files, so set them up concurrently
+    await asyncio.gather(
+      self.init_products_db(products_path),
+      self.init_transactions_db(transactions_path),
+    )
 
-    # Enable WAL mode for Products DB
-    async with self.products_engine.connect() as conn:
-      await conn.execute(text("PRAGMA journal_mode=WAL"))
+  async def init_products_db(self, products_path: str) -> None:
+    """Initialize the products database engine and create its tables."""
+    self.products_engine = _create_sqlite_engine(products_path)
 
-    self.products_session_factory = sessionmaker(
+    self.products_session_factory = async_sessionmaker(
       self.products_engine, expire_on_commit=False, class_=AsyncSession
     )
 
     async with self.products_engine.begin() as conn:
       await conn.run_sync(ProductBase.metadata.create_all)
+      await conn.run_sync(_create_missing_indexes, ProductBase.metadata)
 
+  async def init_transactions_db(self, transactions_path: str) -> None:
+    """Initialize the transactions database engine and create its tables."""
     # Transactions DB Setup (includes Inventory)
-    trans_url = f"sqlite+aiosqlite:///{transactions_path}"
-    self.transactions_engine = create_async_engine(trans_url, echo=False)
-
-    # Enable WAL mode for Transactions DB
-    async with self.transactions_engine.connect() as conn:
-      await conn.execute(text("PRAGMA journal_mode=WAL"))
+    self.transactions_engine = _create_sqlite_engine(transactions_path)
 
-    self.transactions_session_factory = sessionmaker(
+    self.transactions_session_factory = async_sessionmaker(
       self.transactions_engine, expire_on_commit=False, class_=AsyncSession
     )
 
     async with self.transactions_engine.begin() as conn:
       await conn.run_sync(TransactionBase.metadata.create_all)
+      await conn.run_sync(_create_missing_indexes, TransactionBase.metadata)
 
   async def close(self) -> None:
     """Close all database engines."""
-    if self.products_engine:
-      await self.products_engine.dispose()
-    if self.transactions_engine:
-      await self.transactions_engine.dispose()
+    for engine in (self.products_engine, self.transactions_engine):
+      if engine:
+        # Let SQLite refresh its query planner statistics before shutdown;
+        # this is only an optimization, so a failure must not skip dispose
+        try:
+          async with engine.connect() as conn:
+            await conn.execute(text("PRAGMA optimize"))
+        except SQLAlchemyError as e:
+          logger.warning("PRAGMA optimize failed for %s: %s", engine.url, e)
+        finally:
+          await engine.dispose()
 
 
 # Global manager instance (to be initialized via lifespan)
 manager = DatabaseManager()
 
 
+def create_readonly_session_factory(path: str) -> async_sessionmaker:
+  """Create a session factory that opens a database file read-only.
+
+  Intended for the dump scripts: the file is opened with mode=ro, so no
+  tables are created and no pragmas or journal changes are written.
+  """
+  # as_uri() percent-encodes characters such as '#', '?' and spaces. URL.create
+  # keeps the database string verbatim, so it is escaped exactly once; a
+  # parsed URL string would be decoded again and '#' would end the filename.
+  url = URL.create(
+    "sqlite+aiosqlite",
+    database=pathlib.Path(path).resolve().as_uri(),
+    query={"mode": "ro", "uri": "true"},
+  )
+  engine = create_async_engine(url, echo=False)
+  return async_sessionmaker(engine, expire_on_commit=False, class_=AsyncSession)
+
+
 class Product(ProductBase):
   """Product database model."""
 
@@ -162,7 +259,7 @@ class CustomerAddress(TransactionBase):
   __tablename__ = "customer_addresses"
 
   id = Column(String, primary_key=True)
-  customer_id = Column(String, ForeignKey("customers.id"))
+  customer_id = Column(String, ForeignKey("customers.id"), index=True)
   street_address = Column(String)
   city = Column(String)
   state = Column(String)
@@ -247,7 +344,7 @@ class ShippingRate(TransactionBase):
   __tablename__ = "shipping_rates"
 
   id = Column(String, primary_key=True)
-  country_code = Column(String)  # e.g., 'US', 'default'
+  country_code = Column(String, index=True)  # e.g., 'US', 'default'
   service_level = Column(String)  # e.g., 'standard', 'express'
   price = Column(Integer)  # In cents
   title = Column(String)
@@ -274,26 +371,12 @@ async def get_shipping_rates(
       ShippingRate.country_code.in_([country_code, "default"])
     )
   )
-  return list(result.scalars().all())
-
-
-async def get_discount(session: AsyncSession, code: str) -> Discount | None:
-  """Retrieve a discount by code.
-
-  Args:
-    session: The database session to use.
-    code: The discount code to look up.
-
-  Returns:
-    The Discount object if found, otherwise None.
-
-  """
-  return await session.get(Discount, code)
+  return list(result.scalars())
 
 
 async def get_discounts_by_codes(
   session: AsyncSession, codes: list[str]
-) -> list[Discount]:
+) -> dict[str, Discount]:
   """Retrieve multiple discounts by their codes in a single query.
 
   Args:
@@ -301,19 +384,19 @@ async def get_discounts_by_codes(
     codes: A list of discount codes to look up.
 
   Returns:
-    A list of matching Discount objects.
+    A mapping from code to Discount for the codes that exist.
 
   """
   result = await session.execute(
     select(Discount).where(Discount.code.in_(codes))
   )
-  return list(result.scalars().all())
+  return {discount.code: discount for discount in result.scalars()}
 
 
 async def get_active_promotions(session: AsyncSession) -> list[Promotion]:
   """Retrieve all active promotions."""
   result = await session.execute(select(Promotion))
-  return list(result.scalars().all())
+  return list(result.scalars())
 
 
 async def get_product(session: AsyncSession, product_id: str) -> Product | None:
@@ -347,7 +430,7 @@ async def get_customer_addresses(
   result = await session.execute(
     select(CustomerAddress).where(CustomerAddress.customer_id == customer.id)
   )
-  return list(result.scalars().all())
+  return list(result.scalars())
 
 
 async def get_customer(session: AsyncSession, email: str) -> Customer | None:
@@ -372,36 +455,42 @@ async def save_customer_address(
     The ID of the saved or existing address.
 
   """
-  customer = await get_customer(session, email)
-  if not customer:
-    # Create customer if missing
-    customer = Customer(id=str(uuid.uuid4()), email=email, name="Unknown")
-    session.add(customer)
-    # Flush to get ID if needed, though we set it manually
-    await session.flush()
-
-  # Check for existing address with same content
-  stmt = select(CustomerAddress).where(
-    CustomerAddress.customer_id == customer.id,
-    CustomerAddress.street_address == address.get("street_address"),
-    # Map locality to city
-    CustomerAddress.city == address.get("address_locality"),
-    # Map region to state
-    CustomerAddress.state == address.get("address_region"),
-    CustomerAddress.postal_code == address.get("postal_code"),
-    CustomerAddress.country == address.get("address_country"),
+  # Look up the customer and any address with the same content in one query
+  stmt = (
+    select(Customer.id, CustomerAddress.id)
+    .outerjoin(
+      CustomerAddress,
+      and_(
+        CustomerAddress.customer_id == Customer.id,
+        CustomerAddress.street_address == address.get("street_address"),
+        # Map locality to city
+        CustomerAddress.city == address.get("address_locality"),
+        # Map region to state
+        CustomerAddress.state == address.get("address_region"),
+        CustomerAddress.postal_code == address.get("postal_code"),
+        CustomerAddress.country == address.get("address_country"),
+      ),
+    )
+    .where(Customer.email == email)
   )
   result = await session.execute(stmt)
-  existing_addr = result.scalar_one_or_none()
+  row = result.one_or_none()
 
-  if existing_addr:
-    return existing_addr.id
+  if row is None:
+    # Create customer if missing. The ID is set manually, so no flush is
+    # needed; the unit of work inserts it before the address below.
+    customer_id = str(uuid.uuid4())
+    session.add(Customer(id=customer_id, email=email, name="Unknown"))
+  else:
+    customer_id, existing_addr_id = row
+    if existing_addr_id:
+      return existing_addr_id
 
   # Create new address
   new_id = address.get("id") or str(uuid.uuid4())
   new_addr = CustomerAddress(
     id=new_id,
-    customer_id=customer.id,
+    customer_id=customer_id,
     street_address=address.get("street_address"),
     # Map locality to city
     city=address.get("address_locality"),
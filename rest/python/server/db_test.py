@@ -0,0 +1,134 @@
+#   Copyright 2026 UCP Authors
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+
+"""Tests for the database helpers."""
+
+import asyncio
+from pathlib import Path
+import shutil
+import tempfile
+from unittest import mock
+
+from absl.testing import absltest
+from absl.testing import parameterized
+import db
+from sqlalchemy import select
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+
+class DatabaseManagerCloseTest(absltest.TestCase):
+  """Tests for DatabaseManager.close."""
+
+  def test_disposes_engines_when_optimize_fails(self) -> None:
+    """A failing PRAGMA optimize must not leave an engine undisposed."""
+    disposed = []
+    dispose = AsyncEngine.dispose
+
+    async def record_dispose(engine: AsyncEngine, *args, **kwargs) -> None:
+      disposed.append(engine)
+      await dispose(engine, *args, **kwargs)
+
+    async def run() -> None:
+      manager = db.DatabaseManager()
+      await manager.init_dbs(":memory:", ":memory:")
+      with (
+        mock.patch.object(
+          db, "text", return_value=text("SELECT * FROM no_such_table")
+        ),
+        mock.patch.object(AsyncEngine, "dispose", record_dispose),
+        self.assertLogs(db.logger, "WARNING") as logs,
+      ):
+        await manager.close()
+      self.assertEqual(
+        disposed, [manager.products_engine, manager.transactions_engine]
+      )
+      self.assertLen(logs.records, 2)
+
+    asyncio.run(run())
+
+
+class ReadonlySessionFactoryTest(parameterized.TestCase):
+  """Tests for create_readonly_session_factory."""
+
+  def setUp(self) -> None:
+    """Create a temporary directory for test databases."""
+    super().setUp()
+    self.test_dir = Path(tempfile.mkdtemp())
+
+  def tearDown(self) -> None:
+    """Remove the temporary directory."""
+    shutil.rmtree(self.test_dir)
+    super().tearDown()
+
+  @parameterized.named_parameters(
+    ("hash", "data#1"),
+    ("space", "my data"),
+    ("hash_and_space", "a #b"),
+  )
+  def test_opens_existing_file_read_only(self, dir_name: str) -> None:
+    """The dump scripts must read the given file and never write to it."""
+    db_dir = self.test_dir / dir_name
+    db_dir.mkdir()
+    transactions_path = db_dir / "transactions.db"
+
+    async def run() -> None:
+      manager = db.DatabaseManager()
+      await manager.init_dbs(
+        str(db_dir / "products.db"), str(transactions_path)
+      )
+      async with manager.transactions_session_factory() as session:
+        session.add(db.Inventory(product_id="rose", quantity=3))
+        await session.commit()
+      await manager.close()
+
+      session_factory = db.create_readonly_session_factory(
+        str(transactions_path)
+      )
+      async with session_factory() as session:
+        result = await session.execute(
+          select(db.Inventory.product_id, db.Inventory.quantity)
+        )
+        self.assertEqual(result.all(), [("rose", 3)])
+
+        with self.assertRaises(OperationalError):
+          await session.execute(text("CREATE TABLE scratch (id INTEGER)"))
+      await session_factory.kw["bind"].dispose()
+
+    asyncio.run(run())
+
+    # Nothing may be created at a truncated or otherwise mangled path
+    self.assertEqual(
+      sorted(p.name for p in self.test_dir.iterdir()), [dir_name]
+    )
+
+  def test_missing_file_is_not_created(self) -> None:
+    """Opening a missing database fails instead of creating an empty one."""
+    missing_path = self.test_dir / "x#y" / "missing.db"
+    missing_path.parent.mkdir()
+
+    async def run() -> None:
+      session_factory = db.create_readonly_session_factory(str(missing_path))
+      async with session_factory() as session:
+        with self.assertRaises(OperationalError):
+          await session.execute(text("SELECT 1"))
+      await session_factory.kw["bind"].dispose()
+
+    asyncio.run(run())
+    self.assertEqual(list(missing_path.parent.iterdir()), [])
+
+
+if __name__ == "__main__":
+  absltest.main()
@@ -38,6 +38,15 @@ from services.fulfillment_service import FulfillmentService
 from sqlalchemy.ext.asyncio import AsyncSession
 
 
+# Extracts the version parameter from the UCP-Agent header.
+# We look for 'version=' either at the start or after a semicolon,
+# allowing for whitespace.
+# Matches: version="1.2.3" or version=1.2.3
+_UCP_AGENT_VERSION_RE = re.compile(
+  r"(?:^|;)\s*version=(?:\"([^\"]+)\"|([^;]+))", re.IGNORECASE
+)
+
+
 class CommonHeaders(BaseModel):
   """Common headers used in UCP requests."""
 
@@ -68,13 +77,7 @@ async def validate_ucp_headers(ucp_agent: str):
   server_version = config.get_server_version()
   agent_version = server_version  # Default to server version if not specified
 
-  # Use regex to extract version more robustly.
-  # We look for 'version=' either at the start or after a semicolon,
-  # allowing for whitespace.
-  # Matches: version="1.2.3" or version=1.2.3
-  match = re.search(
-    r"(?:^|;)\s*version=(?:\"([^\"]+)\"|([^;]+))", ucp_agent, re.IGNORECASE
-  )
+  match = _UCP_AGENT_VERSION_RE.search(ucp_agent)
   if match:
     # Group 1 is quoted value, Group 2 is unquoted value
     agent_version = match.group(1) or match.group(2)
@@ -27,10 +27,8 @@ import sys
 from absl import app as absl_app
 from absl import flags
 from db import Inventory
+from db import create_readonly_session_factory
 from sqlalchemy import select
-from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.ext.asyncio import create_async_engine
-from sqlalchemy.orm import sessionmaker
 
 FLAGS = flags.FLAGS
 flags.DEFINE_string("transactions_db_path", None, "Path to transactions DB")
@@ -42,20 +40,21 @@ async def dump_inventory():
     sys.stderr.write("Error: --transactions_db_path is required.\n")
     sys.exit(1)
 
-  db_url = f"sqlite+aiosqlite:///{FLAGS.transactions_db_path}"
-  engine = create_async_engine(db_url, echo=False)
-  session_factory = sessionmaker(
-    engine, expire_on_commit=False, class_=AsyncSession
-  )
+  session_factory = create_readonly_session_factory(FLAGS.transactions_db_path)
 
   async with session_factory() as session:
-    result = await session.execute(select(Inventory))
-    items = result.scalars().all()
+    # Stream plain (product_id, quantity) rows in batches so output starts
+    # immediately and memory stays flat regardless of table size
+    rows = await session.stream(
+      select(Inventory.product_id, Inventory.quantity).execution_options(
+        yield_per=1000
+      )
+    )
 
     writer = csv.writer(sys.stdout)
     writer.writerow(["product_id", "quantity"])
-    for item in items:
-      writer.writerow([item.product_id, item.quantity])
+    async for batch in rows.partitions():
+      writer.writerows(batch)
 
 
 def main(argv):
@@ -30,11 +30,9 @@ import sys
 from absl import app as absl_app
 from absl import flags
 from db import CheckoutSession
+from db import create_readonly_session_factory
 from db import RequestLog
 from sqlalchemy import select
-from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.ext.asyncio import create_async_engine
-from sqlalchemy.orm import sessionmaker
 
 FLAGS = flags.FLAGS
 flags.DEFINE_string("transactions_db_path", None, "Path to transactions DB")
@@ -49,32 +47,30 @@ async def dump_logs():
     sys.stderr.write("Error: --transactions_db_path is required.\n")
     sys.exit(1)
 
-  db_url = f"sqlite+aiosqlite:///{FLAGS.transactions_db_path}"
-  engine = create_async_engine(db_url, echo=False)
-  session_factory = sessionmaker(
-    engine, expire_on_commit=False, class_=AsyncSession
-  )
+  session_factory = create_readonly_session_factory(FLAGS.transactions_db_path)
 
   async with session_factory() as session:
     print("=== REQUEST LOGS ===")  # noqa: T201
-    result = await session.execute(select(RequestLog).order_by(RequestLog.id))
-    logs = result.scalars().all()
-
-    if not logs:
-      print("No request logs found.")  # noqa: T201
-      return
-
-    for log in logs:
+    # Join the correlated transaction status into the same query instead of
+    # looking it up per log row, and stream rows in batches so output starts
+    # immediately and memory stays flat regardless of table size
+    query = (
+      select(RequestLog, CheckoutSession.status)
+      .outerjoin(CheckoutSession, CheckoutSession.id == RequestLog.checkout_id)
+      .order_by(RequestLog.id)
+      .execution_options(yield_per=1000)
+    )
+    rows = await session.stream(query)
+
+    found = False
+    async for log, transaction_status in rows:
+      found = True
       print(f"[{log.timestamp}] {log.method} {log.url}")  # noqa: T201
       if log.checkout_id:
         print(f"  Checkout ID: {log.checkout_id}")  # noqa: T201
 
-        if FLAGS.show_transaction:
-          transaction_result = await session.get(
-            CheckoutSession, log.checkout_id
-          )
-          if transaction_result:
-            print(f"  Transaction Status: {transaction_result.status}")  # noqa: T201
+        if FLAGS.show_transaction and transaction_status is not None:
+          print(f"  Transaction Status: {transaction_status}")  # noqa: T201
 
       if log.payload:
         try:
@@ -85,6 +81,9 @@ async def dump_logs():
           print(f"  Payload: {log.payload}")  # noqa: T201
       print("-" * 40)  # noqa: T201
 
+    if not found:
+      print("No request logs found.")  # noqa: T201
+
 
 def main(argv):
   """Run the log dump script."""
@@ -28,10 +28,8 @@ import sys
 from absl import app as absl_app
 from absl import flags
 from db import CheckoutSession
+from db import create_readonly_session_factory
 from sqlalchemy import select
-from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.ext.asyncio import create_async_engine
-from sqlalchemy.orm import sessionmaker
 
 FLAGS = flags.FLAGS
 flags.DEFINE_string("transactions_db_path", None, "Path to transactions DB")
@@ -43,21 +41,18 @@ async def dump_transactions():
     sys.stderr.write("Error: --transactions_db_path is required.\n")
     sys.exit(1)
 
-  db_url = f"sqlite+aiosqlite:///{FLAGS.transactions_db_path}"
-  engine = create_async_engine(db_url, echo=False)
-  session_factory = sessionmaker(
-    engine, expire_on_commit=False, class_=AsyncSession
-  )
+  session_factory = create_readonly_session_factory(FLAGS.transactions_db_path)
 
   async with session_factory() as session:
-    result = await session.execute(select(CheckoutSession))
-    checkouts = result.scalars().all()
+    # Stream rows in batches so output starts immediately and memory stays
+    # flat regardless of table size
+    checkouts = await session.stream_scalars(
+      select(CheckoutSession).execution_options(yield_per=1000)
+    )
 
-    if not checkouts:
-      print("No transactions found.")  # noqa: T201
-      return
-
-    for checkout in checkouts:
+    found = False
+    async for checkout in checkouts:
+      found = True
       print(f"Transaction: {checkout.id} [{checkout.status}]")  # noqa: T201
       try:
         if isinstance(checkout.data, str):
@@ -83,6 +78,9 @@ async def dump_transactions():
         print("  (Error parsing transaction data)")  # noqa: T201
       print("-" * 60)  # noqa: T201
 
+    if not found:
+      print("No transactions found.")  # noqa: T201
+
 
 def main(argv):
   """Run the transaction dump script."""
@@ -24,10 +24,13 @@ Usage:
 """
 
 import asyncio
+from collections.abc import Iterable
 import csv
+import itertools
 import json
 import logging
 from pathlib import Path
+from typing import Any
 from absl import app as absl_app
 from absl import flags
 import db
@@ -40,6 +43,8 @@ from db import Product
 from db import Promotion
 from db import ShippingRate
 from sqlalchemy import delete
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession
 
 FLAGS = flags.FLAGS
 flags.DEFINE_string("products_db_path", "products.db", "Path to products DB")
@@ -55,6 +60,22 @@ flags.DEFINE_string(
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Rows per executemany call when importing CSV files
+_INSERT_BATCH_SIZE = 500
+
+
+async def _bulk_insert(
+  session: AsyncSession, model: type, rows: Iterable[dict[str, Any]]
+) -> None:
+  """Insert rows in executemany batches, skipping the ORM unit of work.
+
+  Rows are consumed lazily, so only one batch is held in memory at a time.
+  """
+  rows = iter(rows)
+  # Stops before an empty batch, which would emit INSERT ... DEFAULT VALUES
+  while batch := list(itertools.islice(rows, _INSERT_BATCH_SIZE)):
+    await session.execute(insert(model), batch)
+
 
 async def import_csv_data() -> None:
   """Read CSV files and populate the database."""
@@ -69,48 +90,42 @@ async def import_csv_data() -> None:
       await session.execute(delete(Product))
 
       logger.info("Importing Products from CSV...")
-      products = []
       with (data_dir / "products.csv").open() as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-          products.append(
-            Product(
-              id=row["id"],
-              title=row["title"],
-              price=int(row["price"]),
-              image_url=row["image_url"],
-            )
-          )
-      session.add_all(products)
+        products = (
+          {
+            "id": row["id"],
+            "title": row["title"],
+            "price": int(row["price"]),
+            "image_url": row["image_url"],
+          }
+          for row in csv.DictReader(f)
+        )
+        await _bulk_insert(session, Product, products)
 
       logger.info("Clearing existing promotions...")
       await session.execute(delete(Promotion))
 
       logger.info("Importing Promotions from CSV...")
-      promotions = []
       promotions_path = data_dir / "promotions.csv"
       if promotions_path.exists():
         with promotions_path.open() as f:
-          reader = csv.DictReader(f)
-          for row in reader:
-            min_subtotal = (
-              int(row["min_subtotal"]) if row.get("min_subtotal") else None
-            )
-            eligible_item_ids = (
-              json.loads(row["eligible_item_ids"])
-              if row.get("eligible_item_ids")
-              else None
-            )
-            promotions.append(
-              Promotion(
-                id=row["id"],
-                type=row["type"],
-                min_subtotal=min_subtotal,
-                eligible_item_ids=eligible_item_ids,
-                description=row["description"],
-              )
-            )
-        session.add_all(promotions)
+          promotions = (
+            {
+              "id": row["id"],
+              "type": row["type"],
+              "min_subtotal": (
+                int(row["min_subtotal"]) if row.get("min_subtotal") else None
+              ),
+              "eligible_item_ids": (
+                json.loads(row["eligible_item_ids"])
+                if row.get("eligible_item_ids")
+                else None
+              ),
+              "description": row["description"],
+            }
+            for row in csv.DictReader(f)
+          )
+          await _bulk_insert(session, Promotion, promotions)
 
       await session.commit()
 
@@ -120,56 +135,44 @@ async def import_csv_data() -> None:
       await session.execute(delete(Inventory))
 
       logger.info("Importing Inventory from CSV...")
-      inventory = []
       with (data_dir / "inventory.csv").open() as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-          inventory.append(
-            Inventory(
-              product_id=row["product_id"], quantity=int(row["quantity"])
-            )
-          )
-      session.add_all(inventory)
+        inventory = (
+          {"product_id": row["product_id"], "quantity": int(row["quantity"])}
+          for row in csv.DictReader(f)
+        )
+        await _bulk_insert(session, Inventory, inventory)
 
       logger.info("Clearing existing customers and addresses...")
       await session.execute(delete(CustomerAddress))
       await session.execute(delete(Customer))
 
       logger.info("Importing Customers from CSV...")
-      customers = []
       customers_path = data_dir / "customers.csv"
       if customers_path.exists():
         with customers_path.open() as f:
-          reader = csv.DictReader(f)
-          for row in reader:
-            customers.append(
-              Customer(
-                id=row["id"],
-                name=row["name"],
-                email=row["email"],
-              )
-            )
-        session.add_all(customers)
+          customers = (
+            {"id": row["id"], "name": row["name"], "email": row["email"]}
+            for row in csv.DictReader(f)
+          )
+          await _bulk_insert(session, Customer, customers)
 
       logger.info("Importing Customer Addresses from CSV...")
-      addresses = []
       addresses_path = data_dir / "addresses.csv"
       if addresses_path.exists():
         with addresses_path.open() as f:
-          reader = csv.DictReader(f)
-          for row in reader:
-            addresses.append(
-              CustomerAddress(
-                id=row["id"],
-                customer_id=row["customer_id"],
-                street_address=row["street_address"],
-                city=row["city"],
-                state=row["state"],
-                postal_code=row["postal_code"],
-                country=row["country"],
-              )
-            )
-        session.add_all(addresses)
+          addresses = (
+            {
+              "id": row["id"],
+              "customer_id": row["customer_id"],
+              "street_address": row["street_address"],
+              "city": row["city"],
+              "state": row["state"],
+              "postal_code": row["postal_code"],
+              "country": row["country"],
+            }
+            for row in csv.DictReader(f)
+          )
+          await _bulk_insert(session, CustomerAddress, addresses)
 
       await session.commit()
 
@@ -177,66 +180,60 @@ async def import_csv_data() -> None:
       await session.execute(delete(PaymentInstrument))
 
       logger.info("Importing Payment Instruments from CSV...")
-      instruments = []
       pi_path = data_dir / "payment_instruments.csv"
       if pi_path.exists():
         with pi_path.open() as f:
-          reader = csv.DictReader(f)
-          for row in reader:
-            instruments.append(
-              PaymentInstrument(
-                id=row["id"],
-                type=row["type"],
-                brand=row["brand"],
-                last_digits=row["last_digits"],
-                token=row["token"],
-                handler_id=row["handler_id"],
-              )
-            )
-      session.add_all(instruments)
+          instruments = (
+            {
+              "id": row["id"],
+              "type": row["type"],
+              "brand": row["brand"],
+              "last_digits": row["last_digits"],
+              "token": row["token"],
+              "handler_id": row["handler_id"],
+            }
+            for row in csv.DictReader(f)
+          )
+          await _bulk_insert(session, PaymentInstrument, instruments)
       await session.commit()
 
       logger.info("Clearing existing discounts...")
       await session.execute(delete(Discount))
 
       logger.info("Importing Discounts from CSV...")
-      discounts = []
       discounts_path = data_dir / "discounts.csv"
       if discounts_path.exists():
         with discounts_path.open() as f:
-          reader = csv.DictReader(f)
-          for row in reader:
-            discounts.append(
-              Discount(
-                code=row["code"],
-                type=row["type"],
-                value=int(row["value"]),
-                description=row["description"],
-              )
-            )
-        session.add_all(discounts)
+          discounts = (
+            {
+              "code": row["code"],
+              "type": row["type"],
+              "value": int(row["value"]),
+              "description": row["description"],
+            }
+            for row in csv.DictReader(f)
+          )
+          await _bulk_insert(session, Discount, discounts)
         await session.commit()
 
       logger.info("Clearing existing shipping rates...")
       await session.execute(delete(ShippingRate))
 
       logger.info("Importing Shipping Rates from CSV...")
-      rates = []
       shipping_path = data_dir / "shipping_rates.csv"
       if shipping_path.exists():
         with shipping_path.open() as f:
-          reader = csv.DictReader(f)
-          for row in reader:
-            rates.append(
-              ShippingRate(
-                id=row["id"],
-                country_code=row["country_code"],
-                service_level=row["service_level"],
-                price=int(row["price"]),
-                title=row["title"],
-              )
-            )
-        session.add_all(rates)
+          rates = (
+            {
+              "id": row["id"],
+              "country_code": row["country_code"],
+              "service_level": row["service_level"],
+              "price": int(row["price"]),
+              "title": row["title"],
+            }
+            for row in csv.DictReader(f)
+          )
+          await _bulk_insert(session, ShippingRate, rates)
         await session.commit()
 
     logger.info("Database populated from CSVs.")
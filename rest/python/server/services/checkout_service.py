@@ -1120,13 +1120,11 @@ class CheckoutService:
       checkout.discounts = DiscountsObject()
 
     if checkout.discounts.codes:
-      # Batch fetch discounts to avoid N+1 queries
-      discounts = await db.get_discounts_by_codes(
+      # Batch fetch discounts to avoid N+1 queries, keyed by code so they can
+      # be applied in request order
+      discount_map = await db.get_discounts_by_codes(
         self.transactions_session, checkout.discounts.codes
       )
-      # Create a map for easy lookup by code (preserving request order if
-      # needed)
-      discount_map = {d.code: d for d in discounts}
 
       for code in checkout.discounts.codes:
         discount_obj = discount_map.get(code)